@@ -0,0 +1 @@
+# Benchmarks for ReconcileBook Desktop 
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark the reconciliation engine on synthetic data
+
+Runs CSV ingest, matching and PDF reporting at each requested size and
+writes wall time, peak memory and rows/sec per stage as JSON.
+
+    python benchmarks/run_benchmarks.py --sizes 1k 10k --output bench.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Run from a checkout without installing
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import generate_pair
+from src.core.processor import CSVProcessor
+from src.core.matcher import TransactionMatcher
+from src.utils.pdf_generator import PDFGenerator
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+STAGES = ("process_bank", "process_quickbooks", "find_matches", "generate_report")
+SCHEMA_VERSION = 1
+
+
+def measure(func: Callable[[], Any], trace_memory: bool) -> Tuple[Any, float, Optional[int]]:
+    """Run func once, returning its result, wall seconds and peak traced bytes"""
+    if trace_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = func()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def parse_size(label: str) -> Tuple[str, int]:
+    """Accept a preset label (1k, 10k, 100k, 1m) or a plain row count"""
+    key = label.lower()
+    if key in SIZES:
+        return key, SIZES[key]
+    try:
+        rows = int(key)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Unknown size: {label}")
+    if rows <= 0:
+        raise argparse.ArgumentTypeError(f"Size must be positive: {label}")
+    return key, rows
+
+
+def run_size(label: str, rows: int, args: argparse.Namespace, work_dir: Path) -> List[Dict[str, Any]]:
+    """Benchmark every selected stage at one size"""
+    results = []
+
+    def record(stage: str, input_rows: int, seconds: float, peak: Optional[int], **extra):
+        entry = {
+            "size": label,
+            "rows": rows,
+            "stage": stage,
+            "input_rows": input_rows,
+            "seconds": round(seconds, 6),
+            "rows_per_sec": round(input_rows / seconds, 1) if seconds > 0 else None,
+            "peak_memory_bytes": peak
+        }
+        entry.update(extra)
+        results.append(entry)
+        print(f"{label:>6} {stage:<20} {seconds:10.3f}s {entry['rows_per_sec'] or 0:>14,.0f} rows/s"
+              + (f" {peak / 2**20:10.1f} MiB" if peak is not None else ""), file=sys.stderr)
+
+    start = time.perf_counter()
+    bank_path, qb_path = generate_pair(rows, work_dir, seed=args.seed)
+    print(f"{label:>6} generated in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    processor = CSVProcessor()
+    trace = not args.no_memory
+
+    bank, seconds, peak = measure(lambda: processor.process_csv(str(bank_path), "bank"), trace)
+    record("process_bank", rows, seconds, peak, output_rows=len(bank))
+
+    qb, seconds, peak = measure(lambda: processor.process_csv(str(qb_path), "quickbooks"), trace)
+    record("process_quickbooks", rows, seconds, peak, output_rows=len(qb))
+
+    if "find_matches" in args.stages or "generate_report" in args.stages:
+        matcher = TransactionMatcher(args.threshold)
+        result, seconds, peak = measure(
+            lambda: matcher.find_matches(bank, qb, mode=args.mode, workers=args.workers), trace
+        )
+        if "find_matches" in args.stages:
+            record("find_matches", len(bank) + len(qb), seconds, peak,
+                   matches=len(result.matches), pruning=matcher.get_pruning_stats())
+
+    if "generate_report" in args.stages:
+        report_path = work_dir / f"report_{rows}.pdf"
+        _, seconds, peak = measure(lambda: PDFGenerator().generate_report(result, str(report_path)), trace)
+        record("generate_report", len(result.matches), seconds, peak)
+
+    return [entry for entry in results if entry["stage"] in args.stages]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[parse_size(s) for s in SIZES],
+                        help="row counts to run: 1k, 10k, 100k, 1m or a number (default: all presets)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES),
+                        help="stages to report (default: all)")
+    parser.add_argument("--seed", type=int, default=42, help="generator seed (default: 42)")
+    parser.add_argument("--threshold", type=float, default=0.7, help="matcher confidence threshold")
+    parser.add_argument("--mode", choices=TransactionMatcher.MATCHING_MODES, default="greedy")
+    parser.add_argument("--workers", type=int, default=1, help="matcher worker processes")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip tracemalloc; faster, but peak memory is reported as null")
+    parser.add_argument("--data-dir", help="keep generated files here instead of a temporary directory")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "seed": args.seed,
+            "threshold": args.threshold,
+            "mode": args.mode,
+            "workers": args.workers,
+            "memory_traced": not args.no_memory
+        },
+        "results": []
+    }
+
+    with tempfile.TemporaryDirectory(prefix="reconcile-bench-") as temp_dir:
+        work_dir = Path(args.data_dir or temp_dir)
+        for label, rows in args.sizes:
+            report["results"].extend(run_size(label, rows, args, work_dir))
+
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Seeded generator for paired bank/QuickBooks CSV exports
+"""
+
+import csv
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Tuple, Union
+
+VENDORS = [
+    "Amazon Marketplace", "Office Depot", "Staples", "Shell Oil", "Chevron",
+    "Uber Trip", "Lyft Ride", "Delta Air Lines", "Marriott Hotel", "Comcast Business",
+    "Verizon Wireless", "AT&T Mobility", "Adobe Systems", "Microsoft 365", "Google Workspace",
+    "Zoom Video", "Slack Technologies", "Dropbox", "FedEx Shipping", "UPS Store",
+    "Home Depot", "Lowes", "Costco Wholesale", "Walmart Supercenter", "Target Store",
+    "Starbucks Coffee", "Panera Bread", "Chipotle", "City Water Utility", "Pacific Gas Electric",
+    "State Farm Insurance", "Blue Cross Health", "ADP Payroll", "Gusto Payroll", "Intuit QuickBooks",
+    "Stripe Transfer", "Square Deposit", "PayPal Transfer", "Landlord Properties LLC", "Wells Fargo Loan"
+]
+
+CLIENTS = [
+    "ABC Corp", "Northwind Traders", "Contoso Ltd", "Fabrikam Inc", "Globex Corporation",
+    "Initech", "Umbrella Holdings", "Stark Industries", "Wayne Enterprises", "Acme Supply Co"
+]
+
+BANK_PREFIXES = ["POS PURCHASE", "DEBIT CARD", "ACH DEBIT", "ONLINE PMT", "CHECKCARD"]
+QB_SUFFIXES = ["", " - expense", " (monthly)", " payment", " invoice"]
+
+# Rows per calendar day, so larger files span proportionally more days
+ROWS_PER_DAY = 200
+
+
+def _bank_description(rnd: random.Random, payee: str, deposit: bool) -> str:
+    """Describe a payee the way bank statements do"""
+    if deposit:
+        return f"DEPOSIT {payee.upper()} REF {rnd.randint(100000, 999999)}"
+    return f"{rnd.choice(BANK_PREFIXES)} {payee.upper()} #{rnd.randint(1000, 9999)}"
+
+
+def _mangle_description(rnd: random.Random, payee: str, deposit: bool) -> str:
+    """Describe the same payee the way a bookkeeper might in QuickBooks"""
+    words = payee.split()
+    roll = rnd.random()
+    if roll < 0.25:
+        text = payee
+    elif roll < 0.45:
+        text = words[0]
+    elif roll < 0.6 and len(words) > 1:
+        text = " ".join(reversed(words))
+    elif roll < 0.75:
+        text = payee.lower()
+    elif roll < 0.9:
+        text = payee[:max(4, len(payee) - rnd.randint(1, 6))]
+    else:
+        text = f"{payee} {rnd.choice(CLIENTS)}"
+    if deposit:
+        return f"Payment from {text}"
+    return text + rnd.choice(QB_SUFFIXES)
+
+
+def _fee_adjusted(rnd: random.Random, amount: Decimal) -> Decimal:
+    """Amount net of a card or transfer fee"""
+    if rnd.random() < 0.5:
+        fee = Decimal(rnd.choice(["0.01", "0.25", "1.50", "2.95"]))
+    else:
+        fee = (abs(amount) * Decimal(rnd.choice(["0.01", "0.029", "0.03"]))).quantize(Decimal("0.01"))
+    return amount - fee if amount > 0 else amount + fee
+
+
+def generate_pair(rows: int, output_dir: Union[str, Path], seed: int = 42) -> Tuple[Path, Path]:
+    """Write a bank and a QuickBooks CSV with about `rows` rows each
+
+    Most bank rows have a QuickBooks counterpart with realistic noise:
+    1-3 day posting lag, fee deltas, rewritten descriptions and the
+    occasional duplicate entry. The rest are left unmatched on either side.
+    Returns the (bank_path, quickbooks_path) pair.
+    """
+    rnd = random.Random(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    bank_path = output_dir / f"bank_{rows}.csv"
+    qb_path = output_dir / f"quickbooks_{rows}.csv"
+
+    start = date(2023, 1, 1)
+    days = max(30, rows // ROWS_PER_DAY)
+
+    with open(bank_path, "w", newline="", encoding="utf-8") as bank_file, \
+            open(qb_path, "w", newline="", encoding="utf-8") as qb_file:
+        bank_writer = csv.writer(bank_file)
+        qb_writer = csv.writer(qb_file)
+        # CSVProcessor only picks up a lowercase "reference" column
+        bank_writer.writerow(["Date", "Description", "Amount", "reference"])
+        qb_writer.writerow(["Date", "Memo", "Amount", "Account", "reference"])
+
+        for i in range(rows):
+            deposit = rnd.random() < 0.2
+            payee = rnd.choice(CLIENTS if deposit else VENDORS)
+            cents = rnd.randint(10000, 2500000) if deposit else -rnd.randint(150, 500000)
+            amount = Decimal(cents) / 100
+            posted = start + timedelta(days=rnd.randrange(days))
+            reference = f"TX{seed:04d}{i:08d}" if rnd.random() < 0.3 else ""
+
+            bank_row = [posted.isoformat(), _bank_description(rnd, payee, deposit), f"{amount:.2f}", reference]
+            bank_writer.writerow(bank_row)
+            if rnd.random() < 0.01:
+                # Duplicate line in the bank export
+                bank_writer.writerow(bank_row)
+
+            roll = rnd.random()
+            if roll < 0.08:
+                # Missing from QuickBooks
+                continue
+            if roll < 0.1:
+                # Entered in QuickBooks with no bank counterpart
+                payee = rnd.choice(VENDORS)
+                amount = Decimal(-rnd.randint(150, 500000)) / 100
+                reference = ""
+
+            booked = posted - timedelta(days=rnd.choice([0, 0, 0, 1, 1, 2, 3]))
+            qb_amount = _fee_adjusted(rnd, amount) if rnd.random() < 0.15 else amount
+            qb_row = [booked.strftime("%m/%d/%Y"), _mangle_description(rnd, payee, deposit),
+                      f"{qb_amount:.2f}", "Income" if deposit else "Expenses",
+                      reference if rnd.random() < 0.5 else ""]
+            qb_writer.writerow(qb_row)
+            if rnd.random() < 0.005:
+                qb_writer.writerow(qb_row)
+
+    return bank_path, qb_path
@@ -0,0 +1,128 @@
+"""
+Maximum-weight bipartite assignment for transaction matching
+"""
+
+import heapq
+from collections import defaultdict
+from typing import List, Tuple, Dict, Hashable
+
+# Confidence scores are scaled to integers so path costs compare exactly
+WEIGHT_SCALE = 10 ** 9
+
+
+def _components(edges: List[Tuple[Hashable, Hashable, float]]) -> List[List[int]]:
+    """Group edge indices by connected component of the bipartite graph"""
+    parent: Dict[Tuple[int, Hashable], Tuple[int, Hashable]] = {}
+
+    def find(node):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for left, right, _ in edges:
+        a, b = (0, left), (1, right)
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    groups = defaultdict(list)
+    for i, (left, _, _) in enumerate(edges):
+        groups[find((0, left))].append(i)
+    return list(groups.values())
+
+
+def _solve_component(edges: List[Tuple[Hashable, Hashable, float]]) -> List[Tuple[Hashable, Hashable]]:
+    """Sparse shortest-augmenting-path (Hungarian) solve of one component
+    
+    Every left node gets a private zero-cost "leave unmatched" column, which
+    turns maximum-weight matching into a full assignment of the left side.
+    Rows are inserted one at a time with a Dijkstra search over reduced costs,
+    so each search only explores the neighbourhood it needs.
+    """
+    lefts = list(dict.fromkeys(left for left, _, _ in edges))
+    rights = list(dict.fromkeys(right for _, right, _ in edges))
+    left_ix = {node: i for i, node in enumerate(lefts)}
+    right_ix = {node: i for i, node in enumerate(rights)}
+    n_left, n_right = len(lefts), len(rights)
+
+    # Columns 0..R-1 are real, R+i is the unmatched column of row i
+    adjacency: List[List[Tuple[int, int]]] = [[] for _ in range(n_left)]
+    for left, right, weight in edges:
+        adjacency[left_ix[left]].append((right_ix[right], -int(round(weight * WEIGHT_SCALE))))
+    for i in range(n_left):
+        adjacency[i].append((n_right + i, 0))
+
+    row_potential = [0] * n_left
+    col_potential = [0] * (n_right + n_left)
+    col_row = [-1] * (n_right + n_left)
+    row_col = [-1] * n_left
+
+    for start in range(n_left):
+        row_potential[start] = min(cost - col_potential[j] for j, cost in adjacency[start])
+
+        row_dist = {start: 0}
+        col_dist: Dict[int, int] = {}
+        col_prev: Dict[int, int] = {}
+        done = []
+        done_set = set()
+        heap = []
+        row = start
+
+        while True:
+            base = row_dist[row] - row_potential[row]
+            for j, cost in adjacency[row]:
+                if j in done_set:
+                    continue
+                d = base + cost - col_potential[j]
+                if j not in col_dist or d < col_dist[j]:
+                    col_dist[j] = d
+                    col_prev[j] = row
+                    heapq.heappush(heap, (d, j))
+
+            while True:
+                d, j = heapq.heappop(heap)
+                if j not in done_set and d == col_dist[j]:
+                    break
+            done.append(j)
+            done_set.add(j)
+            row = col_row[j]
+            if row == -1:
+                break
+            row_dist[row] = d
+
+        # Shift potentials so reduced costs stay non-negative and the new
+        # path is tight
+        for i, dist in row_dist.items():
+            row_potential[i] += d - dist
+        for k in done:
+            col_potential[k] -= d - col_dist[k]
+
+        # Augment along the alternating path back to the inserted row
+        while True:
+            row = col_prev[j]
+            previous = row_col[row]
+            col_row[j] = row
+            row_col[row] = j
+            if row == start:
+                break
+            j = previous
+
+    return [(lefts[i], rights[j]) for i, j in enumerate(row_col) if j < n_right]
+
+
+def max_weight_matching(edges: List[Tuple[Hashable, Hashable, float]]) -> List[Tuple[Hashable, Hashable]]:
+    """Solve maximum-weight bipartite matching over a sparse list of
+    (left, right, weight) edges and return the chosen (left, right) pairs"""
+    pairs = []
+    for component in _components(edges):
+        if len(component) == 1:
+            left, right, _ = edges[component[0]]
+            pairs.append((left, right))
+        else:
+            pairs.extend(_solve_component([edges[i] for i in component]))
+    return pairs
@@ -0,0 +1,283 @@
+"""
+Engine host process: runs CSV ingest, matching and reporting away from the GUI
+"""
+
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .models import ReconciliationResult, Transaction, TransactionTable
+from .progress import CancellationToken, ReconciliationCancelled
+from .session import apply_matcher_settings, decode_result, encode_result, load_session, save_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EngineMessage:
+    """One message from the engine process about a job
+
+    kind is "progress" (payload is a MatchProgress), "result", "error"
+    (payload is the message text) or "cancelled".
+    """
+    job_id: int
+    kind: str
+    payload: Any = None
+
+
+def table_payload(transactions) -> Dict[str, Any]:
+    """Columnar, picklable form of a TransactionTable or transaction list
+
+    Numeric columns travel as whole arrays and text as interned pools, so
+    a batch costs a few large pickles instead of one object per row.
+    """
+    if not isinstance(transactions, TransactionTable):
+        transactions = TransactionTable.from_transactions(transactions)
+    payload = transactions.to_arrays()
+    for name in TransactionTable.TEXT_COLUMNS:
+        payload[f"{name}_pool"] = list(payload[f"{name}_pool"])
+    if payload["id_prefix"] is None:
+        payload["ids"] = list(payload["ids"])
+    return payload
+
+
+def rows_from_payload(payload: Dict[str, Any]) -> List[Transaction]:
+    """Rebuild the transaction rows sent by table_payload"""
+    return TransactionTable.from_arrays(payload).rows()
+
+
+class _EngineState:
+    """Data and workers living in the engine process; one method per job kind"""
+
+    def __init__(self):
+        self._processor = None
+        self._matcher = None
+        self.transactions: Dict[str, List[Transaction]] = {"bank": [], "quickbooks": []}
+        self.result: Optional[ReconciliationResult] = None
+
+    # pandas, difflib and reportlab load on the first job that needs them,
+    # so a freshly started engine is ready quickly
+
+    @property
+    def processor(self):
+        if self._processor is None:
+            from .processor import CSVProcessor
+            self._processor = CSVProcessor()
+        return self._processor
+
+    @property
+    def matcher(self):
+        if self._matcher is None:
+            from .matcher import TransactionMatcher
+            self._matcher = TransactionMatcher()
+        return self._matcher
+
+    def run(self, kind: str, params: Dict[str, Any], progress, cancel: CancellationToken):
+        job = getattr(self, f"job_{kind}", None)
+        if job is None:
+            raise ValueError(f"Unknown engine job: {kind}")
+        return job(progress=progress, cancel=cancel, **params)
+
+    def job_process_csv(self, path: str, source: str, progress, cancel) -> Dict[str, Any]:
+        """Ingest a CSV file; the rows come back as a table payload"""
+        table = self.processor.process_csv_table(path, source)
+        self.transactions[source] = table.rows()
+        self.result = None
+        return table_payload(table)
+
+    def job_find_matches(self, settings: Dict[str, Any], progress, cancel) -> Dict[str, Any]:
+        """Reconcile the loaded files, streaming progress"""
+        apply_matcher_settings(self.matcher, settings)
+        self.result = self.matcher.find_matches(
+            self.transactions["bank"],
+            self.transactions["quickbooks"],
+            progress=progress,
+            cancel=cancel
+        )
+        return encode_result(self.result)
+
+    def job_generate_report(self, path: str, progress, cancel):
+        """Write the PDF report for the current result"""
+        from ..utils.pdf_generator import PDFGenerator
+
+        PDFGenerator().generate_report(self._current_result(), path)
+
+    def job_save_session(self, path: str, settings: Dict[str, Any], progress, cancel):
+        """Save the current result as a session snapshot"""
+        save_session(self._current_result(), path, settings)
+
+    def job_open_session(self, path: str, progress, cancel) -> Dict[str, Any]:
+        """Load a session snapshot as the current data and send it to the caller"""
+        result, settings = load_session(path)
+        self.result = result
+        self.transactions = {"bank": result.bank_transactions, "quickbooks": result.quickbooks_transactions}
+        return {
+            "bank": table_payload(result.bank_transactions),
+            "quickbooks": table_payload(result.quickbooks_transactions),
+            "result": encode_result(result),
+            "settings": settings
+        }
+
+    def job_load_state(self, bank: Dict[str, Any], quickbooks: Dict[str, Any],
+                       result: Optional[Dict[str, Any]], progress, cancel):
+        """Adopt data held by the GUI, e.g. after the engine was restarted"""
+        self.transactions = {"bank": rows_from_payload(bank), "quickbooks": rows_from_payload(quickbooks)}
+        self.result = None
+        if result is not None:
+            self.result = decode_result(result, self.transactions["bank"], self.transactions["quickbooks"])
+
+    def job_clear(self, progress, cancel):
+        """Drop all loaded data"""
+        self.transactions = {"bank": [], "quickbooks": []}
+        self.result = None
+
+    def _current_result(self) -> ReconciliationResult:
+        if self.result is None:
+            raise ValueError("No reconciliation results in the engine")
+        return self.result
+
+
+def _engine_main(requests, responses):
+    """Engine process loop
+
+    Jobs run one at a time on a worker thread, in submission order, while
+    this loop keeps reading requests so cancellations arrive promptly.
+    """
+    state = _EngineState()
+    jobs = queue.Queue()
+    tokens: Dict[int, CancellationToken] = {}
+
+    def run_jobs():
+        while True:
+            job_id, kind, params = jobs.get()
+            if kind is None:
+                return
+            token = tokens[job_id]
+
+            def progress(snapshot, job_id=job_id):
+                responses.put(EngineMessage(job_id, "progress", snapshot))
+
+            try:
+                token.raise_if_cancelled()
+                responses.put(EngineMessage(job_id, "result", state.run(kind, params, progress, token)))
+            except ReconciliationCancelled:
+                responses.put(EngineMessage(job_id, "cancelled"))
+            except Exception as e:
+                logger.exception(f"Engine job {kind} failed")
+                responses.put(EngineMessage(job_id, "error", str(e)))
+            finally:
+                tokens.pop(job_id, None)
+
+    worker = threading.Thread(target=run_jobs, daemon=True)
+    worker.start()
+
+    while True:
+        job_id, kind, params = requests.get()
+        if kind == "cancel":
+            token = tokens.get(params["job_id"])
+            if token is not None:
+                token.cancel()
+        elif kind == "shutdown":
+            jobs.put((None, None, None))
+            break
+        else:
+            tokens[job_id] = CancellationToken()
+            jobs.put((job_id, kind, params))
+    worker.join()
+
+
+class EngineClient:
+    """GUI-side handle on the engine process
+
+    submit() queues a job and returns its id; poll() returns the messages
+    that have arrived since the last call without blocking, so it can be
+    driven from the Tk event loop. A stuck engine can be replaced with
+    restart(), which fails its pending jobs; the caller re-sends its data.
+    """
+
+    def __init__(self):
+        # Never fork a process that has a Tk interpreter running
+        self._context = multiprocessing.get_context("spawn")
+        self._job_ids = itertools.count(1)
+        self.pending: Dict[int, str] = {}
+        self.process = None
+        self.start()
+
+    def start(self):
+        """Start a fresh engine process with fresh queues"""
+        self._requests = self._context.Queue()
+        self._responses = self._context.Queue()
+        self.process = self._context.Process(
+            target=_engine_main,
+            args=(self._requests, self._responses),
+            name="reconcile-engine",
+            daemon=True
+        )
+        self.process.start()
+        logger.info(f"Started engine process {self.process.pid}")
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def submit(self, kind: str, **params) -> int:
+        """Queue a job; its messages carry the returned id"""
+        job_id = next(self._job_ids)
+        self.pending[job_id] = kind
+        self._requests.put((job_id, kind, params))
+        return job_id
+
+    def cancel(self, job_id: int):
+        """Ask the engine to cancel a queued or running job"""
+        if job_id in self.pending:
+            self._requests.put((None, "cancel", {"job_id": job_id}))
+
+    def poll(self, limit: int = 100) -> List[EngineMessage]:
+        """Messages received so far, at most limit per call
+
+        If the engine process has died, its pending jobs are reported as
+        errors.
+        """
+        messages = []
+        while len(messages) < limit:
+            try:
+                message = self._responses.get_nowait()
+            except queue.Empty:
+                break
+            if message.kind != "progress":
+                self.pending.pop(message.job_id, None)
+            messages.append(message)
+
+        if not messages and self.pending and not self.alive:
+            messages = [
+                EngineMessage(job_id, "error", "The engine process stopped unexpectedly")
+                for job_id in self.pending
+            ]
+            self.pending.clear()
+        return messages
+
+    def restart(self) -> List[int]:
+        """Kill the engine and start a new one; returns the abandoned job ids"""
+        abandoned = list(self.pending)
+        self.pending.clear()
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        self.start()
+        return abandoned
+
+    def shutdown(self):
+        """Stop the engine process"""
+        if self.alive:
+            self._requests.put((None, "shutdown", {}))
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.process = None
@@ -0,0 +1,184 @@
+"""
+Candidate generation (blocking) for transaction matching
+"""
+
+import bisect
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, ROUND_FLOOR
+from typing import List, Iterable, Dict, Optional, Set
+
+import numpy as np
+
+from .models import Transaction
+from .text import normalize_description
+from .kernels import char_histograms
+
+
+def amount_to_cents(amount: Decimal) -> int:
+    """Convert an amount to whole cents, rounding towards negative infinity"""
+    return int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_FLOOR))
+
+
+def is_whole_cents(amount: Decimal) -> bool:
+    """Check whether an amount has no sub-cent precision"""
+    return Decimal(amount) * 100 == amount_to_cents(amount)
+
+
+def day_number(date: Optional[datetime]) -> Optional[int]:
+    """Day ordinal of a date-only timestamp, or None if it carries a time of day"""
+    if not date:
+        return None
+    if isinstance(date, datetime) and (date.hour or date.minute or date.second or date.microsecond):
+        return None
+    return date.toordinal()
+
+
+class BlockingIndex:
+    """Buckets QuickBooks transactions by posting day and amount so that only
+    plausible pairs reach the full scorer"""
+
+    # Amount bands a pair outside the date window may still need
+    BAND_NONE = 0
+    BAND_CENTS = 1
+    BAND_RATIO = 2
+    BAND_ALL = 3
+
+    def __init__(self, transactions: Iterable[Transaction], date_tolerance_days: int = 3,
+                 amount_tolerance: Decimal = Decimal('0.01')):
+        self.transactions = list(transactions)
+        self.date_tolerance_days = date_tolerance_days
+        # One extra cent/day on each side keeps lookups a superset of what the
+        # scorer accepts (floor rounding of sub-cent amounts, time-of-day offsets)
+        self.cents_window = amount_to_cents(amount_tolerance) + 1
+        self.day_window = date_tolerance_days + 1
+
+        self.by_day: Dict[int, List[int]] = defaultdict(list)
+        self.by_cents: Dict[int, List[int]] = defaultdict(list)
+        positive = []
+        self.negative_positions: List[int] = []
+
+        for pos, tx in enumerate(self.transactions):
+            if tx.date:
+                self.by_day[tx.date.toordinal()].append(pos)
+            cents = amount_to_cents(tx.amount)
+            self.by_cents[cents].append(pos)
+            if tx.amount > 0:
+                positive.append((tx.amount, pos))
+            elif tx.amount < 0:
+                self.negative_positions.append(pos)
+
+        positive.sort()
+        self.positive_amounts = [amount for amount, _ in positive]
+        self.positive_positions = [pos for _, pos in positive]
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def date_candidates(self, tx: Transaction) -> List[int]:
+        """Positions of transactions posted within the date tolerance"""
+        if not tx.date:
+            return []
+        day = tx.date.toordinal()
+        positions = []
+        for offset in range(-self.day_window, self.day_window + 1):
+            positions.extend(self.by_day.get(day + offset, ()))
+        return positions
+
+    def amount_candidates(self, tx: Transaction, band: int) -> List[int]:
+        """Positions of transactions whose amount falls in the given band"""
+        if band == self.BAND_NONE:
+            return []
+        if band == self.BAND_ALL:
+            return list(range(len(self.transactions)))
+
+        positions = self._cents_candidates(tx)
+        if band == self.BAND_RATIO:
+            if tx.amount > 0:
+                positions.extend(self._ratio_candidates(tx))
+            elif tx.amount < 0:
+                positions.extend(self.negative_positions)
+        return positions
+
+    def band_candidates(self, transactions: Iterable[Transaction], band: int) -> Set[int]:
+        """Positions amount_candidates gives for any of transactions
+
+        Each position is visited once however many of transactions share it,
+        so a whole shard of bank rows can be looked up cheaply.
+        """
+        if band == self.BAND_NONE:
+            return set()
+        if band == self.BAND_ALL:
+            return set(range(len(self.transactions)))
+
+        positions: Set[int] = set()
+        any_negative = False
+        for tx in transactions:
+            positions.update(self._cents_candidates(tx))
+            if band == self.BAND_RATIO:
+                if tx.amount > 0:
+                    positions.update(self._ratio_candidates(tx))
+                elif tx.amount < 0:
+                    any_negative = True
+        if any_negative:
+            positions.update(self.negative_positions)
+        return positions
+
+    def _cents_candidates(self, tx: Transaction) -> List[int]:
+        cents = amount_to_cents(tx.amount)
+        positions = []
+        for offset in range(-self.cents_window, self.cents_window + 1):
+            positions.extend(self.by_cents.get(cents + offset, ()))
+        return positions
+
+    def _ratio_candidates(self, tx: Transaction) -> List[int]:
+        # Mirrors the 5% fee rule in calculate_amount_similarity for a positive
+        # amount; two negative amounts always satisfy min/max > 0.95 there
+        low = bisect.bisect_left(self.positive_amounts, tx.amount * Decimal('0.95'))
+        high = bisect.bisect_right(self.positive_amounts, tx.amount / Decimal('0.95'))
+        return self.positive_positions[low:high + 1]
+
+    def candidates(self, tx: Transaction, band: int = BAND_CENTS) -> List[int]:
+        """Sorted positions of every transaction that could pair with tx"""
+        if band == self.BAND_ALL:
+            return list(range(len(self.transactions)))
+        positions = set(self.date_candidates(tx))
+        positions.update(self.amount_candidates(tx, band))
+        return sorted(positions)
+
+
+class CandidateIndex(BlockingIndex):
+    """Blocking buckets plus the columns score_candidates reads"""
+
+    def __init__(self, transactions: Iterable[Transaction], date_tolerance_days: int = 3,
+                 amount_tolerance: Decimal = Decimal('0.01')):
+        super().__init__(transactions, date_tolerance_days, amount_tolerance)
+
+        self.descriptions = [normalize_description(tx.description) for tx in self.transactions]
+        # Normalized lengths (-1 for an empty description) and character
+        # histograms bound the description score without running SequenceMatcher
+        self.text_lengths = np.array([len(d[0]) if d else -1 for d in self.descriptions], dtype=np.int64)
+        self.words_lengths = np.array([len(d[1]) if d else -1 for d in self.descriptions], dtype=np.int64)
+        self.text_histograms = char_histograms(d[0] if d else "" for d in self.descriptions)
+        self.words_histograms = char_histograms(d[1] if d else "" for d in self.descriptions)
+
+        # Integer day/cent columns for the vectorized kernels. They are only
+        # exact for date-only timestamps and whole-cent amounts, so anything
+        # else keeps to the scalar scorer.
+        tolerance_cents = Decimal(amount_tolerance) * 100
+        self.tolerance_cents = int(tolerance_cents) if tolerance_cents == int(tolerance_cents) else None
+        day_numbers = [day_number(tx.date) for tx in self.transactions]
+        self.vectorized = (
+            self.tolerance_cents is not None and
+            None not in day_numbers and
+            all(is_whole_cents(tx.amount) for tx in self.transactions)
+        )
+        if self.vectorized:
+            self.days = np.array(day_numbers, dtype=np.int64)
+            self.cents = np.array([amount_to_cents(tx.amount) for tx in self.transactions], dtype=np.int64)
+        else:
+            self.days = self.cents = None
+
+    def can_vectorize(self, tx: Transaction) -> bool:
+        """Whether tx can be scored against this index with the array kernels"""
+        return self.vectorized and day_number(tx.date) is not None and is_whole_cents(tx.amount)
@@ -2,43 +2,68 @@
 Transaction matching algorithm for reconciliation
 """
 
+import copy
+import heapq
 import logging
-from typing import List, Tuple, Dict, Any
+from collections import defaultdict
+from typing import List, Tuple, Dict, Any, Optional, Iterable, Callable
 from decimal import Decimal
 from difflib import SequenceMatcher
-import re
 
-from .models import Transaction, Match, ReconciliationResult
+import numpy as np
+
+from .models import Transaction, TransactionRow, Match, ReconciliationResult
+from .indexing import BlockingIndex, CandidateIndex, amount_to_cents, day_number
+from .kernels import date_similarity_batch, amount_similarity_batch, description_bound_batch, char_histograms
+from .text import NormalizedDescription, normalize_description
+from .assignment import max_weight_matching
+from .parallel import score_in_shards
+from .progress import CancellationToken, MatchProgress, ProgressReporter
 
 logger = logging.getLogger(__name__)
 
 class TransactionMatcher:
     """Smart transaction matching algorithm"""
     
+    MATCHING_MODES = ("greedy", "optimal")
+    
     def __init__(self, confidence_threshold: float = 0.7):
         self.confidence_threshold = confidence_threshold
         self.date_tolerance_days = 3
         self.amount_tolerance = Decimal('0.01')
+        self.weights = {
+            'description': 0.4,
+            'date': 0.3,
+            'amount': 0.3
+        }
+        # Pair rows sharing a unique reference or amount + date before fuzzy matching
+        self.exact_key_prepass = True
+        # Minimum seconds between progress callbacks
+        self.progress_interval = 0.1
+        # Candidates per bank row a pooled greedy run sends back from its
+        # shards; rows whose kept candidates all get claimed are rescored
+        self.shard_top_candidates = 4
+        self.reset_pruning_stats()
+        self._suggestion_cache = None
     
     def calculate_similarity(self, str1: str, str2: str) -> float:
         """Calculate string similarity using SequenceMatcher"""
-        if not str1 or not str2:
+        return self.compare_descriptions(normalize_description(str1), normalize_description(str2))
+    
+    def compare_descriptions(self, desc1: Optional[NormalizedDescription],
+                             desc2: Optional[NormalizedDescription]) -> float:
+        """Calculate similarity between two pre-normalized descriptions"""
+        if not desc1 or not desc2:
             return 0.0
         
-        # Normalize strings
-        str1 = str1.lower().strip()
-        str2 = str2.lower().strip()
-        
-        # Remove common words that don't help matching
-        common_words = {'the', 'and', 'or', 'of', 'for', 'with', 'by', 'in', 'on', 'at', 'to', 'from'}
-        str1_words = [w for w in re.findall(r'\w+', str1) if w not in common_words]
-        str2_words = [w for w in re.findall(r'\w+', str2) if w not in common_words]
+        str1, str1_words = desc1
+        str2, str2_words = desc2
         
         if not str1_words or not str2_words:
             return SequenceMatcher(None, str1, str2).ratio()
         
         # Calculate word-level similarity
-        word_similarity = SequenceMatcher(None, ' '.join(str1_words), ' '.join(str2_words)).ratio()
+        word_similarity = SequenceMatcher(None, str1_words, str2_words).ratio()
         
         # Calculate character-level similarity
         char_similarity = SequenceMatcher(None, str1, str2).ratio()
@@ -77,19 +102,11 @@ class TransactionMatcher:
         
         return 0.0
     
-    def calculate_match_confidence(self, bank_tx: Transaction, qb_tx: Transaction) -> Tuple[float, str]:
-        """Calculate overall match confidence and reason"""
-        # Calculate individual similarities
-        desc_similarity = self.calculate_similarity(bank_tx.description, qb_tx.description)
-        date_similarity = self.calculate_date_similarity(bank_tx.date, qb_tx.date)
-        amount_similarity = self.calculate_amount_similarity(bank_tx.amount, qb_tx.amount)
-        
+    def combine_similarities(self, desc_similarity: float, date_similarity: float,
+                             amount_similarity: float) -> Tuple[float, str]:
+        """Weight the component similarities into a confidence and reason"""
         # Weight the similarities
-        weights = {
-            'description': 0.4,
-            'date': 0.3,
-            'amount': 0.3
-        }
+        weights = self.weights
         
         overall_confidence = (
             desc_similarity * weights['description'] +
@@ -118,40 +135,208 @@ class TransactionMatcher:
         
         return overall_confidence, reason
     
-    def find_matches(self, bank_transactions: List[Transaction], 
-                    quickbooks_transactions: List[Transaction]) -> ReconciliationResult:
-        """Find matches between bank and QuickBooks transactions"""
+    def calculate_match_confidence(self, bank_tx: Transaction, qb_tx: Transaction) -> Tuple[float, str]:
+        """Calculate overall match confidence and reason"""
+        # Calculate individual similarities
+        desc_similarity = self.calculate_similarity(bank_tx.description, qb_tx.description)
+        date_similarity = self.calculate_date_similarity(bank_tx.date, qb_tx.date)
+        amount_similarity = self.calculate_amount_similarity(bank_tx.amount, qb_tx.amount)
+        
+        return self.combine_similarities(desc_similarity, date_similarity, amount_similarity)
+    
+    def scoring_settings(self) -> Dict[str, Any]:
+        """The settings that decide which pairs match and how they score"""
+        return {
+            "confidence_threshold": self.confidence_threshold,
+            "date_tolerance_days": self.date_tolerance_days,
+            "amount_tolerance": str(self.amount_tolerance),
+            "weights": dict(self.weights)
+        }
+    
+    def reset_pruning_stats(self):
+        """Reset the per-stage pruning counters"""
+        self.pruning_stats = {
+            "key_matches": 0,
+            "candidate_pairs": 0,
+            "pruned_by_threshold": 0,
+            "pruned_by_best": 0,
+            "descriptions_compared": 0
+        }
+    
+    def get_pruning_stats(self) -> Dict[str, int]:
+        """Get pruning counters accumulated since the last reset"""
+        return dict(self.pruning_stats)
+    
+    def score_candidates(self, bank_tx: Transaction, index: CandidateIndex,
+                         positions: List[int], best_only: bool = False,
+                         top: Optional[int] = None) -> List[Tuple[int, float, str]]:
+        """Score a block of candidate positions against one bank transaction
         
+        Returns (position, confidence, reason) for every candidate reaching the
+        confidence threshold. With top, only the top candidates are returned,
+        highest confidence first (earliest position on ties); best_only is
+        top=1. Date and amount components are computed first, with the NumPy
+        kernels when the data allows it, and together with a character-
+        histogram bound on the description score bound each confidence.
+        Descriptions are only compared for candidates whose bound can still
+        qualify.
+        """
+        stats = self.pruning_stats
+        stats["candidate_pairs"] += len(positions)
+        if not positions:
+            return []
+        
+        weights = self.weights
+        threshold = self.confidence_threshold
+        bank_desc = normalize_description(bank_tx.description)
+        block = np.asarray(positions, dtype=np.int64)
+        desc_bounds = self._description_bounds(bank_desc, index, block)
+        
+        if index.can_vectorize(bank_tx):
+            date_similarities = date_similarity_batch(
+                day_number(bank_tx.date), index.days[block], self.date_tolerance_days
+            )
+            amount_similarities = amount_similarity_batch(
+                amount_to_cents(bank_tx.amount), index.cents[block], index.tolerance_cents
+            )
+            bounds = (
+                desc_bounds * weights['description'] +
+                date_similarities * weights['date'] +
+                amount_similarities * weights['amount']
+            )
+            keep = bounds >= threshold
+            candidates = list(zip(
+                block[keep].tolist(),
+                bounds[keep].tolist(),
+                date_similarities[keep].tolist(),
+                amount_similarities[keep].tolist()
+            ))
+        else:
+            candidates = []
+            for pos, desc_bound in zip(positions, desc_bounds.tolist()):
+                qb_tx = index.transactions[pos]
+                date_similarity = self.calculate_date_similarity(bank_tx.date, qb_tx.date)
+                amount_similarity = self.calculate_amount_similarity(bank_tx.amount, qb_tx.amount)
+                bound = (
+                    desc_bound * weights['description'] +
+                    date_similarity * weights['date'] +
+                    amount_similarity * weights['amount']
+                )
+                if bound >= threshold:
+                    candidates.append((pos, bound, date_similarity, amount_similarity))
+        
+        stats["pruned_by_threshold"] += len(positions) - len(candidates)
+        if best_only:
+            top = 1
+        
+        if top is None:
+            scores = []
+            for pos, _, date_similarity, amount_similarity in candidates:
+                desc_similarity = self.compare_descriptions(bank_desc, index.descriptions[pos])
+                stats["descriptions_compared"] += 1
+                confidence, reason = self.combine_similarities(desc_similarity, date_similarity, amount_similarity)
+                if confidence >= threshold:
+                    scores.append((pos, confidence, reason))
+            return scores
+        
+        # Visit the most promising candidates first so the running top can
+        # rule out the rest without comparing their descriptions
+        candidates.sort(key=lambda c: (-c[1], c[0]))
+        # Min-heap of (confidence, -position, reason): the weakest kept
+        # candidate, the later one on equal confidence, is on top
+        kept = []
+        
+        for i, (pos, bound, date_similarity, amount_similarity) in enumerate(candidates):
+            if len(kept) == top:
+                weakest_confidence, weakest_pos = kept[0][0], -kept[0][1]
+                if bound < weakest_confidence:
+                    stats["pruned_by_best"] += len(candidates) - i
+                    break
+                if bound == weakest_confidence and pos > weakest_pos:
+                    stats["pruned_by_best"] += 1
+                    continue
+            
+            desc_similarity = self.compare_descriptions(bank_desc, index.descriptions[pos])
+            stats["descriptions_compared"] += 1
+            confidence, reason = self.combine_similarities(desc_similarity, date_similarity, amount_similarity)
+            
+            if confidence < threshold:
+                continue
+            if len(kept) < top:
+                heapq.heappush(kept, (confidence, -pos, reason))
+            elif (confidence, -pos) > kept[0][:2]:
+                heapq.heapreplace(kept, (confidence, -pos, reason))
+        
+        return [(-neg_pos, confidence, reason) for confidence, neg_pos, reason in sorted(kept, reverse=True)]
+    
+    @staticmethod
+    def _description_bounds(bank_desc: Optional[NormalizedDescription], index: CandidateIndex,
+                            block) -> np.ndarray:
+        """Upper bounds of compare_descriptions against the index rows in block
+        
+        block selects rows of the index arrays (a position array or a slice).
+        """
+        bank_text, bank_words = bank_desc or ("", "")
+        bank_histograms = char_histograms([bank_text, bank_words])
+        return description_bound_batch(
+            len(bank_text) if bank_desc else -1,
+            len(bank_words) if bank_desc else -1,
+            bank_histograms[0],
+            bank_histograms[1],
+            index.text_lengths[block],
+            index.words_lengths[block],
+            index.text_histograms[block],
+            index.words_histograms[block]
+        )
+    
+    def candidate_band(self) -> int:
+        """Amount band a pair outside the date window needs to reach the threshold"""
+        # Best score without any date credit is a perfect description plus the
+        # amount component; solve for the amount similarity that still qualifies
+        needed = (self.confidence_threshold - self.weights['description'] - 1e-9) / self.weights['amount']
+        
+        if needed > 1.0:
+            return CandidateIndex.BAND_NONE
+        elif needed > 0.8:
+            return CandidateIndex.BAND_CENTS
+        elif needed > 0.0:
+            return CandidateIndex.BAND_RATIO
+        return CandidateIndex.BAND_ALL
+    
+    def build_index(self, quickbooks_transactions: Iterable[Transaction]) -> CandidateIndex:
+        """Build a candidate index over QuickBooks transactions
+        
+        Accepts any iterable, so streamed CSV batches can be chained in
+        without building an intermediate list.
+        """
+        return CandidateIndex(
+            quickbooks_transactions,
+            date_tolerance_days=self.date_tolerance_days,
+            amount_tolerance=self.amount_tolerance
+        )
+    
+    def _match_greedy(self, bank_sorted: List[Transaction], index: CandidateIndex,
+                      band: int, reporter: Optional[ProgressReporter] = None) -> List[Match]:
+        """Let each bank transaction claim its best remaining partner in turn"""
         matches = []
         matched_bank_ids = set()
         matched_qb_ids = set()
         
-        # Sort transactions by date for better matching
-        bank_sorted = sorted(bank_transactions, key=lambda x: x.date)
-        qb_sorted = sorted(quickbooks_transactions, key=lambda x: x.date)
-        
         # Find potential matches
-        for bank_tx in bank_sorted:
+        for rows_done, bank_tx in enumerate(bank_sorted):
+            if reporter is not None:
+                reporter.update(rows_done, self.pruning_stats["candidate_pairs"])
             if bank_tx.id in matched_bank_ids:
                 continue
                 
-            best_match = None
-            best_confidence = 0.0
-            best_reason = ""
-            
-            for qb_tx in qb_sorted:
-                if qb_tx.id in matched_qb_ids:
-                    continue
-                
-                confidence, reason = self.calculate_match_confidence(bank_tx, qb_tx)
-                
-                if confidence > best_confidence and confidence >= self.confidence_threshold:
-                    best_confidence = confidence
-                    best_match = qb_tx
-                    best_reason = reason
+            positions = [
+                pos for pos in index.candidates(bank_tx, band)
+                if index.transactions[pos].id not in matched_qb_ids
+            ]
             
             # Create match if we found a good one
-            if best_match:
+            for pos, best_confidence, best_reason in self.score_candidates(bank_tx, index, positions, best_only=True):
+                best_match = index.transactions[pos]
                 match = Match(
                     bank_transaction=bank_tx,
                     quickbooks_transaction=best_match,
@@ -162,6 +347,344 @@ class TransactionMatcher:
                 matched_bank_ids.add(bank_tx.id)
                 matched_qb_ids.add(best_match.id)
         
+        return matches
+    
+    def _score_all(self, bank_sorted: List[Transaction], index: CandidateIndex,
+                   band: int, reporter: Optional[ProgressReporter] = None) -> List[List[Tuple[int, float, str]]]:
+        """Score every bank transaction's candidates that reach the threshold"""
+        if reporter is None:
+            return [
+                self.score_candidates(bank_tx, index, index.candidates(bank_tx, band))
+                for bank_tx in bank_sorted
+            ]
+        
+        scored = []
+        for rows_done, bank_tx in enumerate(bank_sorted):
+            reporter.update(rows_done, self.pruning_stats["candidate_pairs"])
+            scored.append(self.score_candidates(bank_tx, index, index.candidates(bank_tx, band)))
+        return scored
+    
+    def _assign_greedy(self, bank_sorted: List[Transaction], qb_sorted: List[Transaction],
+                       scored: List[List[Tuple[int, float, str]]],
+                       band: Optional[int] = None, top: Optional[int] = None) -> List[Match]:
+        """Replay the greedy claim order over pre-scored candidates
+        
+        Produces the same matches as _match_greedy: each bank transaction in
+        date order takes its highest-confidence unclaimed candidate, with the
+        earliest QuickBooks row winning ties. If scored holds only each row's
+        top candidates, a row whose top candidates are all claimed is scored
+        again against its unclaimed candidates in band, through an index over
+        qb_sorted built the first time that happens.
+        """
+        matches = []
+        matched_bank_ids = set()
+        matched_qb_ids = set()
+        index = None
+        
+        for bank_tx, candidates in zip(bank_sorted, scored):
+            if bank_tx.id in matched_bank_ids:
+                continue
+            
+            best = None
+            best_confidence = 0.0
+            for pos, confidence, reason in candidates:
+                if confidence > best_confidence and qb_sorted[pos].id not in matched_qb_ids:
+                    best = (pos, confidence, reason)
+                    best_confidence = confidence
+            
+            if best is None and top is not None and len(candidates) >= top:
+                if index is None:
+                    index = self.build_index(qb_sorted)
+                positions = [
+                    pos for pos in index.candidates(bank_tx, band)
+                    if qb_sorted[pos].id not in matched_qb_ids
+                ]
+                rescored = self.score_candidates(bank_tx, index, positions, best_only=True)
+                if rescored:
+                    best = rescored[0]
+            
+            if best:
+                pos, confidence, reason = best
+                matches.append(Match(
+                    bank_transaction=bank_tx,
+                    quickbooks_transaction=qb_sorted[pos],
+                    confidence_score=confidence,
+                    match_reason=reason
+                ))
+                matched_bank_ids.add(bank_tx.id)
+                matched_qb_ids.add(qb_sorted[pos].id)
+        
+        return matches
+    
+    def _assign_optimal(self, bank_sorted: List[Transaction], qb_sorted: List[Transaction],
+                        scored: List[List[Tuple[int, float, str]]]) -> List[Match]:
+        """Choose the pairs above the threshold with the highest total confidence"""
+        edges = []
+        reasons = {}
+        
+        for bank_pos, candidates in enumerate(scored):
+            for pos, confidence, reason in candidates:
+                edges.append((bank_pos, pos, confidence))
+                reasons[(bank_pos, pos)] = (confidence, reason)
+        
+        matches = []
+        for bank_pos, pos in sorted(max_weight_matching(edges)):
+            confidence, reason = reasons[(bank_pos, pos)]
+            matches.append(Match(
+                bank_transaction=bank_sorted[bank_pos],
+                quickbooks_transaction=qb_sorted[pos],
+                confidence_score=confidence,
+                match_reason=reason
+            ))
+        
+        return matches
+    
+    def find_matches(self, bank_transactions: List[Transaction], 
+                    quickbooks_transactions: List[Transaction],
+                    exhaustive: bool = False,
+                    mode: str = "greedy",
+                    workers: int = 1,
+                    progress: Optional[Callable[[MatchProgress], None]] = None,
+                    cancel: Optional[CancellationToken] = None) -> ReconciliationResult:
+        """Find matches between bank and QuickBooks transactions
+        
+        Only pairs sharing a date window or amount band are scored unless
+        exhaustive is set, in which case every pair is compared. Unless
+        exact_key_prepass is off, rows sharing a unique reference or a unique
+        amount + date are paired first and skip fuzzy scoring. In "greedy"
+        mode each bank transaction claims its best remaining partner in date
+        order; "optimal" mode picks the set of pairs with the highest total
+        confidence. With workers > 1 candidate scoring is spread over a
+        process pool in date shards; the result is the same as a serial run.
+        
+        progress, if given, receives a MatchProgress (stage, rows done,
+        pairs scored, ETA) at most every progress_interval seconds on the
+        calling thread. Cancelling the cancel token makes the run raise
+        ReconciliationCancelled at its next progress check.
+        """
+        if mode not in self.MATCHING_MODES:
+            raise ValueError(f"Unknown matching mode: {mode}")
+        
+        self.reset_pruning_stats()
+        reporter = None
+        if progress is not None or cancel is not None:
+            reporter = ProgressReporter(progress, cancel, self.progress_interval)
+            reporter.start_stage("exact keys", len(bank_transactions))
+        
+        key_matches, bank_rest, qb_rest = self._match_exact_keys(bank_transactions, quickbooks_transactions)
+        
+        # Sort transactions by date for better matching
+        bank_sorted = sorted(bank_rest, key=lambda x: x.date)
+        qb_sorted = sorted(qb_rest, key=lambda x: x.date)
+        
+        band = CandidateIndex.BAND_ALL if exhaustive else self.candidate_band()
+        use_pool = workers > 1 and bank_sorted and qb_sorted
+        if reporter is not None:
+            reporter.start_stage("indexing", len(bank_sorted))
+        if use_pool:
+            # Shards build their own scoring indexes; the parent only needs to
+            # know which QuickBooks rows each shard can pair with
+            index = None
+            blocking = BlockingIndex(qb_sorted, self.date_tolerance_days, self.amount_tolerance)
+        else:
+            index = self.build_index(qb_sorted)
+        
+        if reporter is not None:
+            reporter.start_stage("scoring", len(bank_sorted))
+        top = self.shard_top_candidates if mode == "greedy" else None
+        if use_pool:
+            scored, stats = score_in_shards(self, bank_sorted, blocking, band, workers, reporter, top)
+            # Shards count from zero; add to the pre-pass counters rather than replace them
+            for key, value in stats.items():
+                self.pruning_stats[key] += value
+        elif mode == "optimal":
+            scored = self._score_all(bank_sorted, index, band, reporter)
+        else:
+            scored = None
+        
+        if reporter is not None and scored is not None:
+            reporter.start_stage("assigning", len(bank_sorted))
+        if mode == "optimal":
+            matches = self._assign_optimal(bank_sorted, qb_sorted, scored)
+        elif scored is not None:
+            matches = self._assign_greedy(bank_sorted, qb_sorted, scored, band, top)
+        else:
+            matches = self._match_greedy(bank_sorted, index, band, reporter)
+        
+        matches = sorted(key_matches + matches, key=lambda m: m.bank_transaction.date)
+        result = self._build_result(bank_transactions, quickbooks_transactions, matches)
+        if reporter is not None:
+            reporter.finish(self.pruning_stats["candidate_pairs"])
+        return result
+    
+    def find_matches_incremental(self, previous: ReconciliationResult,
+                                 new_bank_transactions: Optional[List[Transaction]] = None,
+                                 new_quickbooks_transactions: Optional[List[Transaction]] = None,
+                                 mode: str = "greedy") -> ReconciliationResult:
+        """Add newly ingested transactions to an existing reconciliation
+        
+        Existing matches are kept. Only pairs involving at least one new
+        transaction are scored, against the previous unmatched pools: two
+        transactions that were both left unmatched already scored below the
+        threshold against each other. That only holds if previous was scored
+        with the current scoring_settings(); otherwise (or if previous does
+        not record them) the previous unmatched pools are rescored against
+        each other too. The exact-key pass runs over the combined unmatched
+        pools. Each ingest numbers its rows from 0, so new transactions whose
+        ids are already in the result are added as copies under a fresh id
+        (see _rekey_transactions).
+        """
+        if mode not in self.MATCHING_MODES:
+            raise ValueError(f"Unknown matching mode: {mode}")
+        
+        self.reset_pruning_stats()
+        new_bank = self._rekey_transactions(previous.bank_transactions, new_bank_transactions or [])
+        new_qb = self._rekey_transactions(previous.quickbooks_transactions, new_quickbooks_transactions or [])
+        new_qb_ids = {tx.id for tx in new_qb}
+        
+        key_matches, bank_rest, qb_rest = self._match_exact_keys(
+            previous.unmatched_bank + new_bank,
+            previous.unmatched_quickbooks + new_qb
+        )
+        
+        bank_pool = sorted(bank_rest, key=lambda x: x.date)
+        qb_pool = sorted(qb_rest, key=lambda x: x.date)
+        new_bank_ids = {tx.id for tx in new_bank}
+        rescore_previous = previous.scoring_settings != self.scoring_settings()
+        if rescore_previous:
+            logger.info("Previous result was scored with other settings; rescoring its unmatched pairs")
+        
+        index = self.build_index(qb_pool)
+        band = self.candidate_band()
+        
+        scored = []
+        for bank_tx in bank_pool:
+            positions = index.candidates(bank_tx, band)
+            if bank_tx.id not in new_bank_ids and not rescore_previous:
+                positions = [pos for pos in positions if qb_pool[pos].id in new_qb_ids]
+            scored.append(self.score_candidates(bank_tx, index, positions))
+        
+        if mode == "optimal":
+            new_matches = self._assign_optimal(bank_pool, qb_pool, scored)
+        else:
+            new_matches = self._assign_greedy(bank_pool, qb_pool, scored)
+        
+        return self._build_result(
+            previous.bank_transactions + new_bank,
+            previous.quickbooks_transactions + new_qb,
+            previous.matches + sorted(key_matches + new_matches, key=lambda m: m.bank_transaction.date)
+        )
+    
+    @staticmethod
+    def _rekey_transactions(existing: List[Transaction],
+                            new_transactions: Iterable[Transaction]) -> List[Transaction]:
+        """New transactions with ids unique against existing and each other
+        
+        A transaction whose id is taken is replaced by a copy with the id
+        suffixed ".1", ".2", ... (the first free one); the rest are kept as is.
+        """
+        taken = {tx.id for tx in existing}
+        rekeyed = []
+        renamed = 0
+        for tx in new_transactions:
+            if tx.id in taken:
+                suffix = 1
+                while f"{tx.id}.{suffix}" in taken:
+                    suffix += 1
+                tx = tx.to_transaction() if isinstance(tx, TransactionRow) else copy.copy(tx)
+                tx.id = f"{tx.id}.{suffix}"
+                renamed += 1
+            taken.add(tx.id)
+            rekeyed.append(tx)
+        if renamed:
+            logger.info(f"Renamed {renamed} new transactions whose ids were already in use")
+        return rekeyed
+    
+    @staticmethod
+    def _reference_key(tx: Transaction) -> Optional[str]:
+        """Join key on a non-empty reference"""
+        reference = (tx.reference or "").strip().lower()
+        return reference or None
+    
+    @staticmethod
+    def _amount_date_key(tx: Transaction) -> Optional[Tuple[Decimal, int]]:
+        """Join key on the exact amount and calendar day"""
+        if not tx.date or tx.amount is None:
+            return None
+        return tx.amount, tx.date.toordinal()
+    
+    def _reference_agrees(self, bank_tx: Transaction, qb_tx: Transaction) -> bool:
+        """Whether a reference hit also agrees on amount and date"""
+        if abs(bank_tx.amount - qb_tx.amount) > self.amount_tolerance:
+            return False
+        return self.calculate_date_similarity(bank_tx.date, qb_tx.date) > 0.0
+    
+    def _match_exact_keys(self, bank_transactions: List[Transaction],
+                          quickbooks_transactions: List[Transaction]
+                          ) -> Tuple[List[Match], List[Transaction], List[Transaction]]:
+        """Hash-join on exact keys and accept unambiguous one-to-one hits
+        
+        References are joined first, then amount + date. A hit is only taken
+        when its key occurs exactly once on each side of the remaining pools.
+        Generic or recycled references ("ACH", short check counters) can be
+        unique and still name different transactions, so a reference hit
+        also needs amounts within amount_tolerance and dates within
+        date_tolerance_days; other hits are left to fuzzy scoring. Returns
+        the key matches and the bank and QuickBooks transactions left for
+        fuzzy matching.
+        """
+        if not self.exact_key_prepass:
+            return [], list(bank_transactions), list(quickbooks_transactions)
+        
+        matches = []
+        bank_rest = list(bank_transactions)
+        qb_rest = list(quickbooks_transactions)
+        
+        key_passes = [
+            (self._reference_key, "matching reference", self._reference_agrees),
+            (self._amount_date_key, "exact amount + exact date (unique)", None)
+        ]
+        for key_func, reason, agrees in key_passes:
+            bank_by_key = defaultdict(list)
+            qb_by_key = defaultdict(list)
+            for tx in bank_rest:
+                key = key_func(tx)
+                if key is not None:
+                    bank_by_key[key].append(tx)
+            for tx in qb_rest:
+                key = key_func(tx)
+                if key is not None:
+                    qb_by_key[key].append(tx)
+            
+            paired_bank_ids = set()
+            paired_qb_ids = set()
+            for key, bank_hits in bank_by_key.items():
+                qb_hits = qb_by_key.get(key)
+                if len(bank_hits) == 1 and qb_hits and len(qb_hits) == 1:
+                    if agrees is not None and not agrees(bank_hits[0], qb_hits[0]):
+                        continue
+                    matches.append(Match(
+                        bank_transaction=bank_hits[0],
+                        quickbooks_transaction=qb_hits[0],
+                        confidence_score=1.0,
+                        match_reason=reason
+                    ))
+                    paired_bank_ids.add(bank_hits[0].id)
+                    paired_qb_ids.add(qb_hits[0].id)
+            
+            bank_rest = [tx for tx in bank_rest if tx.id not in paired_bank_ids]
+            qb_rest = [tx for tx in qb_rest if tx.id not in paired_qb_ids]
+        
+        self.pruning_stats["key_matches"] += len(matches)
+        return matches, bank_rest, qb_rest
+    
+    def _build_result(self, bank_transactions: List[Transaction],
+                      quickbooks_transactions: List[Transaction],
+                      matches: List[Match]) -> ReconciliationResult:
+        """Assemble a reconciliation result from the final set of matches"""
+        matched_bank_ids = {m.bank_transaction.id for m in matches}
+        matched_qb_ids = {m.quickbooks_transaction.id for m in matches}
+        
         # Find unmatched transactions
         unmatched_bank = [tx for tx in bank_transactions if tx.id not in matched_bank_ids]
         unmatched_qb = [tx for tx in quickbooks_transactions if tx.id not in matched_qb_ids]
@@ -174,36 +697,111 @@ class TransactionMatcher:
             unmatched_quickbooks=unmatched_qb,
             total_matched=len(matches),
             total_unmatched=len(unmatched_bank) + len(unmatched_qb),
-            confidence_threshold=self.confidence_threshold
+            confidence_threshold=self.confidence_threshold,
+            scoring_settings=self.scoring_settings()
         )
     
+    def suggestion_index(self, quickbooks_transactions: List[Transaction]) -> CandidateIndex:
+        """Get the candidate index for suggestions, reusing it while the list is unchanged
+        
+        The index is cached against the list object, its length and the
+        tolerances it was built with; call build_index directly after
+        editing transactions in place.
+        """
+        tolerances = (self.date_tolerance_days, self.amount_tolerance)
+        cached = self._suggestion_cache
+        if cached and cached[0] is quickbooks_transactions and cached[1] == tolerances \
+                and len(cached[2]) == len(quickbooks_transactions):
+            return cached[2]
+        
+        index = self.build_index(quickbooks_transactions)
+        self._suggestion_cache = (quickbooks_transactions, tolerances, index)
+        return index
+    
     def suggest_matches(self, bank_tx: Transaction, 
                        quickbooks_transactions: List[Transaction], 
                        limit: int = 5) -> List[Tuple[Transaction, float, str]]:
         """Suggest potential matches for a single transaction"""
-        suggestions = []
+        return self.top_suggestions(bank_tx, self.suggestion_index(quickbooks_transactions), limit)
+    
+    def suggest_matches_batch(self, bank_transactions: List[Transaction],
+                              quickbooks_transactions: List[Transaction],
+                              limit: int = 5) -> List[List[Tuple[Transaction, float, str]]]:
+        """Suggest potential matches for every bank transaction, in input order"""
+        index = self.suggestion_index(quickbooks_transactions)
+        return [self.top_suggestions(bank_tx, index, limit) for bank_tx in bank_transactions]
+    
+    def top_suggestions(self, bank_tx: Transaction, index: CandidateIndex,
+                        limit: int = 5) -> List[Tuple[Transaction, float, str]]:
+        """Top suggestions from an index, ordered by confidence then index position
+        
+        Every pair's confidence is bounded with array operations (exact date and
+        amount components, a character-histogram bound on the description score).
+        Candidates are visited from the highest bound down into a heap of size
+        limit, which stops as soon as no remaining bound can enter it.
+        """
+        if limit <= 0 or not len(index):
+            return []
+        
+        weights = self.weights
+        bank_desc = normalize_description(bank_tx.description)
+        
+        if index.can_vectorize(bank_tx):
+            date_similarities = date_similarity_batch(
+                day_number(bank_tx.date), index.days, self.date_tolerance_days
+            )
+            amount_similarities = amount_similarity_batch(
+                amount_to_cents(bank_tx.amount), index.cents, index.tolerance_cents
+            )
+        else:
+            date_similarities = np.array([
+                self.calculate_date_similarity(bank_tx.date, qb_tx.date) for qb_tx in index.transactions
+            ], dtype=np.float64)
+            amount_similarities = np.array([
+                self.calculate_amount_similarity(bank_tx.amount, qb_tx.amount) for qb_tx in index.transactions
+            ], dtype=np.float64)
         
-        for qb_tx in quickbooks_transactions:
-            confidence, reason = self.calculate_match_confidence(bank_tx, qb_tx)
-            if confidence > 0.3:  # Lower threshold for suggestions
-                suggestions.append((qb_tx, confidence, reason))
+        desc_bounds = self._description_bounds(bank_desc, index, slice(None))
+        bounds = (
+            desc_bounds * weights['description'] +
+            date_similarities * weights['date'] +
+            amount_similarities * weights['amount']
+        )
+        
+        # Lower threshold for suggestions
+        positions = np.flatnonzero(bounds > 0.3)
+        order = positions[np.lexsort((positions, -bounds[positions]))]
         
-        # Sort by confidence and return top matches
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-        return suggestions[:limit]
+        heap = []
+        for pos, bound in zip(order.tolist(), bounds[order].tolist()):
+            if len(heap) == limit:
+                worst_confidence, worst_neg_pos, _ = heap[0]
+                if bound < worst_confidence:
+                    break
+                if bound == worst_confidence and -pos < worst_neg_pos:
+                    continue
+            
+            desc_similarity = self.compare_descriptions(bank_desc, index.descriptions[pos])
+            confidence, reason = self.combine_similarities(
+                desc_similarity, float(date_similarities[pos]), float(amount_similarities[pos])
+            )
+            if confidence <= 0.3:
+                continue
+            
+            entry = (confidence, -pos, reason)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        
+        heap.sort(reverse=True)
+        return [(index.transactions[-neg_pos], confidence, reason) for confidence, neg_pos, reason in heap]
     
     def get_matching_stats(self, result: ReconciliationResult) -> Dict[str, Any]:
         """Get detailed matching statistics"""
         stats = result.get_summary_stats()
         
         # Add confidence distribution
-        confidence_ranges = {
-            "Perfect (95%+)": len([m for m in result.matches if m.confidence_score >= 0.95]),
-            "High (80-95%)": len([m for m in result.matches if 0.8 <= m.confidence_score < 0.95]),
-            "Medium (70-80%)": len([m for m in result.matches if 0.7 <= m.confidence_score < 0.8]),
-            "Low (<70%)": len([m for m in result.matches if m.confidence_score < 0.7])
-        }
-        
-        stats["confidence_distribution"] = confidence_ranges
+        stats["confidence_distribution"] = result.get_confidence_distribution()
         
         return stats 
\ No newline at end of file
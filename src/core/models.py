@@ -2,12 +2,39 @@
 Data models for the reconciliation tool
 """
 
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+import bisect
+import sys
+from collections.abc import Sequence
+from itertools import islice
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Union
 from datetime import datetime
 from decimal import Decimal
 
-@dataclass
+import numpy as np
+
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_SLOTTED = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_new_object = object.__new__
+
+# Formats tried, in order, for string dates passed to Transaction
+TRANSACTION_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y")
+
+
+@lru_cache(maxsize=4096)
+def parse_date_string(text: str) -> datetime:
+    """Parse a date string given to Transaction, caching repeated values"""
+    for fmt in TRANSACTION_DATE_FORMATS[:-1]:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return datetime.strptime(text, TRANSACTION_DATE_FORMATS[-1])
+
+
+@dataclass(**_SLOTTED)
 class Transaction:
     """Represents a single transaction"""
     id: str
@@ -23,16 +50,101 @@ class Transaction:
         if isinstance(self.amount, (int, float)):
             self.amount = Decimal(str(self.amount))
         if isinstance(self.date, str):
-            # Handle various date formats
-            try:
-                self.date = datetime.strptime(self.date, "%Y-%m-%d")
-            except ValueError:
-                try:
-                    self.date = datetime.strptime(self.date, "%m/%d/%Y")
-                except ValueError:
-                    self.date = datetime.strptime(self.date, "%d/%m/%Y")
+            self.date = parse_date_string(self.date)
+    
+    @classmethod
+    def from_parsed(cls, id: str, date: datetime, description: str, amount: Decimal,
+                    category: Optional[str] = None, account: Optional[str] = None,
+                    reference: Optional[str] = None, source: str = "unknown") -> "Transaction":
+        """Build a transaction from already-typed values without __post_init__"""
+        tx = _new_object(cls)
+        tx.id = id
+        tx.date = date
+        tx.description = description
+        tx.amount = amount
+        tx.category = category
+        tx.account = account
+        tx.reference = reference
+        tx.source = source
+        return tx
+    
+    @classmethod
+    def batch_from_parsed(cls, ids: Iterable[str], dates: Iterable[datetime],
+                          descriptions: Iterable[str], amounts: Iterable[Decimal],
+                          references: Iterable[Optional[str]], source: str = "unknown") -> List["Transaction"]:
+        """Build many transactions from parallel columns of already-typed values
+        
+        Trusted bulk path for parsers that have already produced datetime
+        dates and Decimal amounts; nothing is converted or validated.
+        """
+        transactions = []
+        append = transactions.append
+        for tx_id, date, description, amount, reference in zip(ids, dates, descriptions, amounts, references):
+            tx = _new_object(cls)
+            tx.id = tx_id
+            tx.date = date
+            tx.description = description
+            tx.amount = amount
+            tx.category = None
+            tx.account = None
+            tx.reference = reference
+            tx.source = source
+            append(tx)
+        return transactions
 
-@dataclass
+class MatchesView(Sequence):
+    """Read-only live view of a result's matches scoring at least a threshold
+    
+    The threshold is looked up in the result's confidence index on every
+    access, so the view reflects later add_match/remove_match calls.
+    """
+    
+    __slots__ = ("_result", "_min_confidence")
+    
+    def __init__(self, result: "ReconciliationResult", min_confidence: float):
+        self._result = result
+        self._min_confidence = min_confidence
+    
+    def __len__(self) -> int:
+        return self._result.count_matches_at_least(self._min_confidence)
+    
+    def __getitem__(self, index):
+        positions = range(len(self))[index]
+        # Read after len(), which rebuilds the index if it is stale
+        matches = self._result._by_confidence
+        if isinstance(index, slice):
+            return [matches[i] for i in positions]
+        return matches[positions]
+    
+    def __iter__(self) -> Iterator["Match"]:
+        stop = len(self)
+        return islice(self._result._by_confidence, stop)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, MatchesView)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"MatchesView({len(self)} matches)"
+
+
+# Confidence bands reported in match statistics, best first
+CONFIDENCE_BANDS = ("Perfect (95%+)", "High (80-95%)", "Medium (70-80%)", "Low (<70%)")
+
+
+def confidence_band(score: float) -> int:
+    """Band of a confidence score, counting up from Low (0) to Perfect (3)"""
+    if score >= 0.95:
+        return 3
+    if score >= 0.8:
+        return 2
+    if score >= 0.7:
+        return 1
+    return 0
+
+
+@dataclass(**_SLOTTED)
 class Match:
     """Represents a matched pair of transactions"""
     bank_transaction: Transaction
@@ -61,24 +173,377 @@ class ReconciliationResult:
     total_matched: int
     total_unmatched: int
     confidence_threshold: float = 0.7
+    # TransactionMatcher.scoring_settings() the matches were found with, if known
+    scoring_settings: Optional[Dict[str, Any]] = field(default=None, compare=False)
+    # Aggregates over matches, kept up to date by add_match/remove_match
+    _confidence_sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    _band_counts: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    _counted_matches: int = field(default=-1, init=False, repr=False, compare=False)
+    # Matches ordered by descending confidence (ties in match order), with
+    # their negated scores ascending alongside for bisect
+    _by_confidence: List[Match] = field(default_factory=list, init=False, repr=False, compare=False)
+    _negated_scores: List[float] = field(default_factory=list, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._recount()
+    
+    def _recount(self):
+        """Rebuild the match aggregates from scratch"""
+        self._band_counts = [0] * len(CONFIDENCE_BANDS)
+        for match in self.matches:
+            self._band_counts[confidence_band(match.confidence_score)] += 1
+        self._confidence_sum = sum(m.confidence_score for m in self.matches)
+        self._counted_matches = len(self.matches)
+        self._by_confidence = sorted(self.matches, key=lambda m: -m.confidence_score)
+        self._negated_scores = [-m.confidence_score for m in self._by_confidence]
+    
+    def _aggregates(self):
+        """Make sure the aggregates cover matches, even if the list was edited directly"""
+        if self._counted_matches != len(self.matches):
+            self._recount()
+    
+    def add_match(self, match: Match):
+        """Record a new match and take its transactions off the unmatched lists"""
+        self._aggregates()
+        self.matches.append(match)
+        self._band_counts[confidence_band(match.confidence_score)] += 1
+        self._confidence_sum += match.confidence_score
+        self._counted_matches += 1
+        position = bisect.bisect_right(self._negated_scores, -match.confidence_score)
+        self._negated_scores.insert(position, -match.confidence_score)
+        self._by_confidence.insert(position, match)
+        
+        bank_id = match.bank_transaction.id
+        qb_id = match.quickbooks_transaction.id
+        self.unmatched_bank = [tx for tx in self.unmatched_bank if tx.id != bank_id]
+        self.unmatched_quickbooks = [tx for tx in self.unmatched_quickbooks if tx.id != qb_id]
+        self.total_matched = len(self.matches)
+        self.total_unmatched = len(self.unmatched_bank) + len(self.unmatched_quickbooks)
+    
+    def remove_match(self, match: Match):
+        """Drop a match and return its transactions to the unmatched lists"""
+        self._aggregates()
+        self.matches.remove(match)
+        self._band_counts[confidence_band(match.confidence_score)] -= 1
+        self._confidence_sum -= match.confidence_score
+        self._counted_matches -= 1
+        low = bisect.bisect_left(self._negated_scores, -match.confidence_score)
+        high = bisect.bisect_right(self._negated_scores, -match.confidence_score)
+        candidates = range(low, high)
+        position = next((i for i in candidates if self._by_confidence[i] is match), None)
+        if position is None:
+            position = next(i for i in candidates if self._by_confidence[i] == match)
+        del self._negated_scores[position]
+        del self._by_confidence[position]
+        
+        self.unmatched_bank.append(match.bank_transaction)
+        self.unmatched_quickbooks.append(match.quickbooks_transaction)
+        self.total_matched = len(self.matches)
+        self.total_unmatched = len(self.unmatched_bank) + len(self.unmatched_quickbooks)
     
     def get_matches_by_confidence(self, min_confidence: float = None) -> List[Match]:
-        """Get matches above a certain confidence threshold"""
+        """Get matches above a certain confidence threshold, highest first"""
         threshold = min_confidence or self.confidence_threshold
-        return [match for match in self.matches if match.confidence_score >= threshold]
+        return list(self.matches_at_least(threshold))
+    
+    def matches_at_least(self, min_confidence: float) -> "MatchesView":
+        """Matches scoring at least min_confidence, highest first, as a view
+        
+        Found by bisecting the confidence index, so nothing is copied. The
+        view follows later add_match/remove_match calls; take list() of it
+        to keep a snapshot.
+        """
+        return MatchesView(self, min_confidence)
+    
+    def count_matches_at_least(self, min_confidence: float) -> int:
+        """Number of matches scoring at least min_confidence"""
+        self._aggregates()
+        return bisect.bisect_right(self._negated_scores, -min_confidence)
     
     def get_perfect_matches(self) -> List[Match]:
         """Get only perfect matches (95%+ confidence)"""
         return [match for match in self.matches if match.is_perfect_match]
     
+    def get_confidence_distribution(self) -> Dict[str, int]:
+        """Number of matches in each confidence band"""
+        self._aggregates()
+        return dict(zip(CONFIDENCE_BANDS, reversed(self._band_counts)))
+    
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get summary statistics"""
+        self._aggregates()
         return {
             "total_bank_transactions": len(self.bank_transactions),
             "total_quickbooks_transactions": len(self.quickbooks_transactions),
             "total_matches": len(self.matches),
-            "perfect_matches": len(self.get_perfect_matches()),
+            "perfect_matches": self._band_counts[-1],
             "unmatched_bank": len(self.unmatched_bank),
             "unmatched_quickbooks": len(self.unmatched_quickbooks),
-            "average_confidence": sum(m.confidence_score for m in self.matches) / len(self.matches) if self.matches else 0
-        } 
\ No newline at end of file
+            "average_confidence": self._confidence_sum / len(self.matches) if self.matches else 0
+        } 
+
+
+def _intern(values: Iterable[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """Codes into a pool of distinct strings; None becomes -1"""
+    pool: List[str] = []
+    positions: Dict[str, int] = {}
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(-1)
+            continue
+        code = positions.get(value)
+        if code is None:
+            code = positions[value] = len(pool)
+            pool.append(value)
+        codes.append(code)
+    return np.array(codes, dtype=np.int32), pool
+
+
+class TransactionTable:
+    """Columnar store for large transaction sets
+    
+    Amounts are kept as int64 cents, dates as int32 day ordinals and text
+    columns as int32 codes into pools of distinct strings. The few rows
+    that do not fit (sub-cent amounts, times of day, missing dates) keep
+    their exact value on the side. Indexing yields TransactionRow views.
+    """
+    
+    def __init__(self, ids: Union[List[str], np.ndarray], dates: Iterable[Optional[datetime]],
+                 amounts: Iterable[Decimal], descriptions: Iterable[str],
+                 sources: Iterable[str], references: Optional[Iterable[Optional[str]]] = None,
+                 categories: Optional[Iterable[Optional[str]]] = None,
+                 accounts: Optional[Iterable[Optional[str]]] = None, id_prefix: Optional[str] = None):
+        # Ids are either strings or int64 row labels formatted as f"{id_prefix}_{label}"
+        if id_prefix is None:
+            self._ids: Optional[List[str]] = list(ids)
+            self._labels: Optional[np.ndarray] = None
+        else:
+            self._ids = None
+            self._labels = np.asarray(ids, dtype=np.int64)
+        self.id_prefix = id_prefix
+        
+        self.exact_dates: Dict[int, Optional[datetime]] = {}
+        days = []
+        for row, date in enumerate(dates):
+            if date is None or date != datetime.fromordinal(date.toordinal()):
+                self.exact_dates[row] = date
+                days.append(0)
+            else:
+                days.append(date.toordinal())
+        self.days = np.array(days, dtype=np.int32)
+        
+        self.exact_amounts: Dict[int, Decimal] = {}
+        cents = []
+        for row, amount in enumerate(amounts):
+            amount = Decimal(amount)
+            scaled = amount * 100
+            if scaled == scaled.to_integral_value() and abs(scaled) < 2 ** 63:
+                cents.append(int(scaled))
+            else:
+                self.exact_amounts[row] = amount
+                cents.append(0)
+        self.cents = np.array(cents, dtype=np.int64)
+        
+        rows = len(self.days)
+        self.description_codes, self.description_pool = _intern(descriptions)
+        self.source_codes, self.source_pool = _intern(sources)
+        self.reference_codes, self.reference_pool = _intern(references if references is not None else [None] * rows)
+        self.category_codes, self.category_pool = _intern(categories if categories is not None else [None] * rows)
+        self.account_codes, self.account_pool = _intern(accounts if accounts is not None else [None] * rows)
+    
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionTable":
+        """Build a table from transaction objects"""
+        transactions = list(transactions)
+        return cls(
+            ids=[tx.id for tx in transactions],
+            dates=[tx.date for tx in transactions],
+            amounts=[tx.amount for tx in transactions],
+            descriptions=[tx.description for tx in transactions],
+            sources=[tx.source for tx in transactions],
+            references=[tx.reference for tx in transactions],
+            categories=[tx.category for tx in transactions],
+            accounts=[tx.account for tx in transactions]
+        )
+    
+    # Coded text columns, as (codes attribute, pool attribute)
+    TEXT_COLUMNS = {
+        "description": ("description_codes", "description_pool"),
+        "source": ("source_codes", "source_pool"),
+        "reference": ("reference_codes", "reference_pool"),
+        "category": ("category_codes", "category_pool"),
+        "account": ("account_codes", "account_pool")
+    }
+    
+    def to_arrays(self) -> Dict[str, Any]:
+        """The table's columns, pools and side values, for serialization"""
+        columns = {
+            "ids": self._ids if self._ids is not None else self._labels,
+            "id_prefix": self.id_prefix,
+            "days": self.days,
+            "cents": self.cents,
+            "exact_dates": dict(self.exact_dates),
+            "exact_amounts": dict(self.exact_amounts)
+        }
+        for name, (codes, pool) in self.TEXT_COLUMNS.items():
+            columns[f"{name}_codes"] = getattr(self, codes)
+            columns[f"{name}_pool"] = getattr(self, pool)
+        return columns
+    
+    @classmethod
+    def from_arrays(cls, columns: Dict[str, Any]) -> "TransactionTable":
+        """Rebuild a table from to_arrays output without per-row work
+        
+        Arrays are adopted as given, so memory-mapped arrays stay mapped.
+        Pools may be any indexable sequence of strings.
+        """
+        table = cls.__new__(cls)
+        table.id_prefix = columns["id_prefix"]
+        if table.id_prefix is None:
+            table._ids = columns["ids"]
+            table._labels = None
+        else:
+            table._ids = None
+            table._labels = columns["ids"]
+        table.days = columns["days"]
+        table.cents = columns["cents"]
+        table.exact_dates = dict(columns["exact_dates"])
+        table.exact_amounts = dict(columns["exact_amounts"])
+        for name, (codes, pool) in cls.TEXT_COLUMNS.items():
+            setattr(table, codes, columns[f"{name}_codes"])
+            setattr(table, pool, columns[f"{name}_pool"])
+        return table
+    
+    def __len__(self) -> int:
+        return len(self.days)
+    
+    def __getitem__(self, row: int) -> "TransactionRow":
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("transaction row out of range")
+        return TransactionRow(self, row)
+    
+    def __iter__(self) -> Iterator["TransactionRow"]:
+        return (TransactionRow(self, row) for row in range(len(self)))
+    
+    def rows(self) -> List["TransactionRow"]:
+        """Views of every row, for code that expects a list of transactions"""
+        return list(self)
+    
+    def to_transactions(self) -> List[Transaction]:
+        """Materialize every row as a full Transaction"""
+        return [row.to_transaction() for row in self]
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the table"""
+        arrays = (self.days, self.cents, self.description_codes, self.source_codes,
+                  self.reference_codes, self.category_codes, self.account_codes)
+        total = sum(array.nbytes for array in arrays)
+        pools = (self.description_pool, self.source_pool, self.reference_pool,
+                 self.category_pool, self.account_pool)
+        total += sum(sys.getsizeof(value) for pool in pools for value in pool)
+        if self._ids is not None:
+            total += sum(sys.getsizeof(value) for value in self._ids)
+        else:
+            total += self._labels.nbytes
+        return total
+    
+    def row_id(self, row: int) -> str:
+        """Id of a row"""
+        if self._ids is not None:
+            return self._ids[row]
+        return f"{self.id_prefix}_{self._labels[row]}"
+    
+    def row_date(self, row: int) -> Optional[datetime]:
+        """Date of a row as a datetime"""
+        if row in self.exact_dates:
+            return self.exact_dates[row]
+        return datetime.fromordinal(int(self.days[row]))
+    
+    def row_amount(self, row: int) -> Decimal:
+        """Amount of a row as a two-place Decimal (or its exact value)"""
+        if row in self.exact_amounts:
+            return self.exact_amounts[row]
+        return Decimal(int(self.cents[row])).scaleb(-2)
+    
+    @staticmethod
+    def _lookup(codes: np.ndarray, pool: List[str], row: int) -> Optional[str]:
+        """Pooled string for a row's code, or None"""
+        code = codes[row]
+        return pool[code] if code >= 0 else None
+
+
+class TransactionRow:
+    """Read-only view of one TransactionTable row that reads like a Transaction"""
+    
+    __slots__ = ("table", "row")
+    
+    def __init__(self, table: TransactionTable, row: int):
+        self.table = table
+        self.row = row
+    
+    @property
+    def id(self) -> str:
+        return self.table.row_id(self.row)
+    
+    @property
+    def date(self) -> Optional[datetime]:
+        return self.table.row_date(self.row)
+    
+    @property
+    def amount(self) -> Decimal:
+        return self.table.row_amount(self.row)
+    
+    @property
+    def description(self) -> str:
+        return self.table.description_pool[self.table.description_codes[self.row]]
+    
+    @property
+    def source(self) -> Optional[str]:
+        return self.table._lookup(self.table.source_codes, self.table.source_pool, self.row)
+    
+    @property
+    def reference(self) -> Optional[str]:
+        return self.table._lookup(self.table.reference_codes, self.table.reference_pool, self.row)
+    
+    @property
+    def category(self) -> Optional[str]:
+        return self.table._lookup(self.table.category_codes, self.table.category_pool, self.row)
+    
+    @property
+    def account(self) -> Optional[str]:
+        return self.table._lookup(self.table.account_codes, self.table.account_pool, self.row)
+    
+    def to_transaction(self) -> Transaction:
+        """Materialize this row as a full Transaction"""
+        return Transaction(
+            id=self.id,
+            date=self.date,
+            description=self.description,
+            amount=self.amount,
+            category=self.category,
+            account=self.account,
+            reference=self.reference,
+            source=self.source
+        )
+    
+    def __reduce__(self):
+        # Pickle (e.g. to matcher worker processes) as a plain Transaction
+        # rather than dragging the whole table along
+        return (Transaction, (self.id, self.date, self.description, self.amount,
+                              self.category, self.account, self.reference, self.source))
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TransactionRow):
+            other = other.to_transaction()
+        if isinstance(other, Transaction):
+            return self.to_transaction() == other
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return repr(self.to_transaction()).replace("Transaction(", "TransactionRow(", 1)
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Process-pool scoring of candidate pairs, sharded by date window
+"""
+
+import bisect
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import List, Tuple, Dict, Any, Optional
+
+from .indexing import BlockingIndex
+from .models import Transaction
+from .progress import ProgressReporter, ReconciliationCancelled
+
+# Per-process state set up once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+ScoredCandidates = List[Tuple[int, float, str]]
+
+
+def _init_worker(matcher, stop=None):
+    """Receive the matcher settings and stop flag once per worker"""
+    _worker_state["matcher"] = matcher
+    _worker_state["stop"] = stop
+
+
+def _score_shard(bank_shard: List[Transaction], qb_positions: List[int], qb_shard: List[Transaction],
+                 band: int, top: Optional[int]) -> Tuple[List[ScoredCandidates], Dict[str, int]]:
+    """Score one shard of bank rows against its QuickBooks rows
+
+    qb_shard holds the QuickBooks rows at qb_positions (ascending) of the
+    full date-sorted list; candidates are reported by those positions.
+    """
+    matcher = _worker_state["matcher"]
+    stop = _worker_state["stop"]
+    index = matcher.build_index(qb_shard)
+
+    matcher.reset_pruning_stats()
+    scored = []
+    for bank_tx in bank_shard:
+        if stop is not None and stop.is_set():
+            # The run was cancelled; the parent discards this shard
+            break
+        positions = index.candidates(bank_tx, band)
+        scored.append([
+            (qb_positions[pos], confidence, reason)
+            for pos, confidence, reason in matcher.score_candidates(bank_tx, index, positions, top=top)
+        ])
+    return scored, matcher.get_pruning_stats()
+
+
+def shard_plan(bank_sorted: List[Transaction], blocking: BlockingIndex,
+               shard_count: int, band: int) -> List[Tuple[int, int, List[int]]]:
+    """Split date-sorted bank rows into (bank_low, bank_high, qb_positions) shards
+
+    Each shard covers a contiguous run of bank rows and only the QuickBooks
+    rows (positions into the date-sorted list blocking was built over) that
+    can pair with one of them: those posted within the date window around
+    the run, plus those in the amount band of one of its rows. Neighbouring
+    shards overlap.
+    """
+    size = max(1, math.ceil(len(bank_sorted) / shard_count))
+    qb_days = [tx.date.toordinal() for tx in blocking.transactions]
+
+    shards = []
+    for bank_low in range(0, len(bank_sorted), size):
+        bank_high = min(bank_low + size, len(bank_sorted))
+        run = bank_sorted[bank_low:bank_high]
+        qb_low = bisect.bisect_left(qb_days, run[0].date.toordinal() - blocking.day_window)
+        qb_high = bisect.bisect_right(qb_days, run[-1].date.toordinal() + blocking.day_window)
+        positions = blocking.band_candidates(run, band)
+        positions.update(range(qb_low, qb_high))
+        shards.append((bank_low, bank_high, sorted(positions)))
+    return shards
+
+
+def score_in_shards(matcher, bank_sorted: List[Transaction], blocking: BlockingIndex,
+                    band: int, workers: int, reporter: Optional[ProgressReporter] = None,
+                    top: Optional[int] = None) -> Tuple[List[ScoredCandidates], Dict[str, int]]:
+    """Score every bank row's candidates across a process pool
+
+    blocking indexes the date-sorted QuickBooks rows. Returns, for each bank
+    row in order, its candidates that reach the confidence threshold as
+    (QuickBooks position, confidence, reason), only the top ones if top is
+    given (see TransactionMatcher.score_candidates), plus the summed pruning
+    counters of all shards. Progress is reported per finished shard; on
+    cancellation pending shards are dropped and running ones stop at their
+    next row.
+    """
+    shards = shard_plan(bank_sorted, blocking, workers * 4, band)
+    quickbooks_sorted = blocking.transactions
+
+    # Lets running shards stop early when the run is cancelled
+    stop = multiprocessing.Event() if reporter is not None and reporter.token is not None else None
+
+    scored: List[ScoredCandidates] = []
+    stats: Dict[str, int] = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(matcher, stop)) as executor:
+        futures = [
+            executor.submit(_score_shard, bank_sorted[bank_low:bank_high], qb_positions,
+                            [quickbooks_sorted[pos] for pos in qb_positions], band, top)
+            for bank_low, bank_high, qb_positions in shards
+        ]
+        try:
+            # Collect in submission order so the merge is deterministic
+            for future in futures:
+                while reporter is not None and not future.done():
+                    wait([future], timeout=reporter.interval)
+                    reporter.update(len(scored), stats.get("candidate_pairs", 0))
+                shard_scored, shard_stats = future.result()
+                scored.extend(shard_scored)
+                for key, value in shard_stats.items():
+                    stats[key] = stats.get(key, 0) + value
+                if reporter is not None:
+                    reporter.update(len(scored), stats.get("candidate_pairs", 0))
+        except ReconciliationCancelled:
+            if stop is not None:
+                stop.set()
+            for future in futures:
+                future.cancel()
+            raise
+    return scored, stats
@@ -3,17 +3,28 @@ CSV processing and data cleaning for reconciliation
 """
 
 import pandas as pd
+import numpy as np
 import csv
+import codecs
+import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, BinaryIO
 from datetime import datetime
 from decimal import Decimal
 import logging
 
-from .models import Transaction
+from .models import Transaction, TransactionTable
 
 logger = logging.getLogger(__name__)
 
+# A separator followed by one or two final digits is a decimal point
+_DECIMAL_MARK = re.compile(r"([.,])\d{1,2}$")
+# A digit-group separator must be followed by exactly three digits
+_BAD_GROUPING = {
+    ",": re.compile(r",(?!\d{3}(?!\d))"),
+    ".": re.compile(r"\.(?!\d{3}(?!\d))")
+}
+
 class CSVProcessor:
     """Handles CSV file processing and data cleaning"""
     
@@ -26,25 +37,155 @@ class CSVProcessor:
             "%m-%d-%Y",
             "%d-%m-%Y"
         ]
+        # Format sniffing reads this many bytes and looks for the header
+        # in this many rows; delimiters are tried in order
+        self.sniff_bytes = 64 * 1024
+        self.sniff_header_rows = 10
+        self.sniff_delimiters = [',', ';', '\t', '|']
+        # Distinct date strings used to pick a column's date format
+        self.date_sample_size = 200
+        # Chunks iter_csv holds back at most while picking the date format
+        self.stream_hold_chunks = 4
+        # Format inferred for the last date column, and whether the data
+        # fitted another format equally well (e.g. MM/DD vs DD/MM)
+        self.date_format: Optional[str] = None
+        self.date_format_ambiguous = False
+        # Boolean mask (indexed like the CSV) of rows the last process_csv rejected
+        self.rejected_rows: Optional[pd.Series] = None
+    
+    @staticmethod
+    def _column_roles(columns: List[str]) -> Dict[str, Optional[str]]:
+        """Pick the date, amount and description columns by name"""
+        columns = [str(col) for col in columns]
+        
+        # Common column mappings
+        date_columns = [col for col in columns if 'date' in col.lower()]
+        amount_columns = [col for col in columns if 'amount' in col.lower() or 'amt' in col.lower()]
+        desc_columns = [col for col in columns if 'desc' in col.lower() or 'memo' in col.lower() or 'note' in col.lower()]
+        
+        return {
+            "date_column": date_columns[0] if date_columns else None,
+            "amount_column": amount_columns[0] if amount_columns else None,
+            "description_column": desc_columns[0] if desc_columns else None
+        }
+    
+    @staticmethod
+    def _detect_encoding(prefix: bytes) -> str:
+        """Guess the text encoding of a file from its first bytes"""
+        if prefix.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return "utf-16"
+        try:
+            # Incremental decoding tolerates a character cut off at the end
+            codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return "latin-1"
+    
+    def _detect_delimiter(self, lines: List[str]) -> str:
+        """Delimiter that splits the most lines into the same number (> 1) of fields"""
+        best, best_score = ',', 0
+        for delimiter in self.sniff_delimiters:
+            counts = [len(fields) for fields in csv.reader(lines, delimiter=delimiter)]
+            counts = [count for count in counts if count > 1]
+            if not counts:
+                continue
+            modal = max(set(counts), key=counts.count)
+            score = counts.count(modal)
+            if score > best_score:
+                best, best_score = delimiter, score
+        return best
+    
+    @staticmethod
+    def _detect_decimal(amounts: List[str], delimiter: str) -> Optional[str]:
+        """Decimal separator used by a sample of amount strings
+        
+        "1,50" and "1.234,56" use a decimal comma, "1.50" and "1,234.56" a
+        decimal point. If no sampled value shows either, ";"-delimited files
+        are taken to use decimal commas. Returns None if the sample mixes
+        both.
+        """
+        found = set()
+        for value in amounts:
+            mark = _DECIMAL_MARK.search(value.strip())
+            if mark:
+                found.add(mark.group(1))
+        if len(found) > 1:
+            return None
+        if found:
+            return found.pop()
+        return ',' if delimiter == ';' else '.'
+    
+    def sniff_csv(self, handle: BinaryIO) -> Dict[str, Any]:
+        """Detect encoding, delimiter, header row and column roles in one pass
+        
+        Only the first sniff_bytes of the open binary handle are read, and
+        the handle is rewound so the same file object can be handed to the
+        main parse. The header is the first row within the sample that names
+        a date, amount and description column (row 0 if none does). The
+        amount column's decimal separator is detected from the sampled rows
+        (None if they mix decimal commas and points).
+        """
+        start = handle.tell()
+        prefix = handle.read(self.sniff_bytes)
+        handle.seek(start)
+        
+        encoding = self._detect_encoding(prefix)
+        text = prefix.decode(encoding, errors="replace")
+        lines = text.splitlines()
+        if len(prefix) == self.sniff_bytes and len(lines) > 1:
+            # The last line may be cut short
+            lines = lines[:-1]
+        
+        delimiter = self._detect_delimiter(lines)
+        rows = list(csv.reader(lines, delimiter=delimiter))
+        
+        header_row = 0
+        for row_number, fields in enumerate(rows[:self.sniff_header_rows]):
+            if all(self._column_roles(fields).values()):
+                header_row = row_number
+                break
+        columns = rows[header_row] if rows else []
+        
+        info = {
+            "encoding": encoding,
+            "delimiter": delimiter,
+            "header_row": header_row,
+            "columns": columns
+        }
+        info.update(self._column_roles(columns))
+        
+        amounts = []
+        if info["amount_column"] is not None:
+            position = [str(col) for col in columns].index(info["amount_column"])
+            amounts = [fields[position] for fields in rows[header_row + 1:] if len(fields) > position]
+        info["decimal"] = self._detect_decimal(amounts, delimiter)
+        return info
+    
+    def _read_options(self, format_info: Dict[str, Any]) -> Dict[str, Any]:
+        """pd.read_csv keyword arguments for a sniffed file
+        
+        Columns are read as text, so whole-file and streamed ingest parse
+        the same strings whatever pandas would infer from the rows it sees
+        (a reference of 7 stays "7" rather than "7.0" in a column with gaps).
+        """
+        return {
+            "dtype": str,
+            "sep": format_info["delimiter"],
+            "encoding": format_info["encoding"],
+            "skiprows": format_info["header_row"]
+        }
     
     def detect_csv_format(self, file_path: str) -> Dict[str, Any]:
         """Detect the format of a CSV file"""
         try:
-            df = pd.read_csv(file_path, nrows=5)
-            columns = df.columns.tolist()
-            
-            # Common column mappings
-            date_columns = [col for col in columns if 'date' in col.lower()]
-            amount_columns = [col for col in columns if 'amount' in col.lower() or 'amt' in col.lower()]
-            desc_columns = [col for col in columns if 'desc' in col.lower() or 'memo' in col.lower() or 'note' in col.lower()]
-            
-            return {
-                "date_column": date_columns[0] if date_columns else None,
-                "amount_column": amount_columns[0] if amount_columns else None,
-                "description_column": desc_columns[0] if desc_columns else None,
-                "columns": columns,
-                "sample_data": df.head().to_dict('records')
-            }
+            with open(file_path, "rb") as handle:
+                format_info = self.sniff_csv(handle)
+                df = pd.read_csv(handle, nrows=5, **self._read_options(format_info))
+            
+            format_info["sample_data"] = df.head().to_dict('records')
+            return format_info
         except Exception as e:
             logger.error(f"Error detecting CSV format: {e}")
             return {}
@@ -65,22 +206,42 @@ class CSVProcessor:
         logger.warning(f"Could not parse date: {date_str}")
         return None
     
-    def parse_amount(self, amount_str: str) -> Optional[Decimal]:
-        """Parse amount string to Decimal"""
+    def parse_amount(self, amount_str: str, decimal: str = '.') -> Optional[Decimal]:
+        """Parse amount string to Decimal
+        
+        decimal is the decimal separator ('.' or ','); the other one may
+        group digits in threes.
+        """
         if not amount_str or pd.isna(amount_str):
             return None
             
         amount_str = str(amount_str).strip()
         
-        # Remove currency symbols and commas
-        amount_str = amount_str.replace('$', '').replace(',', '')
+        # Remove currency symbols and digit grouping
+        cleaned = self._clean_amount(amount_str, decimal)
         
         try:
-            return Decimal(amount_str)
-        except (ValueError, TypeError):
+            return Decimal(cleaned)
+        except (ArithmeticError, ValueError, TypeError):
             logger.warning(f"Could not parse amount: {amount_str}")
             return None
     
+    @staticmethod
+    def _clean_amount(text: str, decimal: str = '.') -> Optional[str]:
+        """Amount text without currency symbol or grouping, with a '.' decimal point
+        
+        None if a grouping separator is not followed by three digits, so
+        "1,50" under a decimal point is rejected rather than read as 150.
+        """
+        text = text.strip().replace('$', '')
+        grouping = ',' if decimal == '.' else '.'
+        if _BAD_GROUPING[grouping].search(text):
+            return None
+        text = text.replace(grouping, '')
+        if decimal != '.':
+            text = text.replace(decimal, '.')
+        return text
+    
     def clean_description(self, desc: str) -> str:
         """Clean and normalize transaction description"""
         if not desc or pd.isna(desc):
@@ -94,60 +255,188 @@ class CSVProcessor:
         # Convert to lowercase for better matching
         return desc.lower()
     
+    @staticmethod
+    def _present(column: pd.Series) -> np.ndarray:
+        """Mask of values the scalar parsers would not treat as missing"""
+        return (column.notna() & column.astype(bool)).to_numpy()
+    
+    @staticmethod
+    def _to_decimal(text: str) -> Optional[Decimal]:
+        """Decimal for a cleaned amount string, or None if it is not a number"""
+        try:
+            return Decimal(text)
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+    
+    def _parse_distinct(self, column: pd.Series, parse: Callable[[pd.Index], np.ndarray],
+                        missing: Any = None) -> pd.Series:
+        """Apply parse to each distinct present value of column once
+        
+        Exports repeat the same dates (and often amounts and descriptions)
+        many times, so values are parsed per distinct string and broadcast
+        back to the rows.
+        """
+        present = self._present(column)
+        result = np.full(len(column), missing, dtype=object)
+        codes, distinct = pd.factorize(column[present].astype(str))
+        if len(distinct):
+            result[present] = parse(distinct)[codes]
+        return pd.Series(result, index=column.index, dtype=object)
+    
+    def infer_date_format(self, values: pd.Series) -> Tuple[Optional[str], bool]:
+        """Pick the supported format that parses the most of a column's dates
+        
+        Formats are scored on a sample of distinct values; a tie is rescored
+        on all of them. Returns the format (None if none fits) and whether
+        the tie remained, in which case the earliest supported format wins
+        as it does in parse_date.
+        """
+        scope = values[:self.date_sample_size]
+        while True:
+            counts = [
+                int(pd.to_datetime(scope, format=fmt, errors="coerce").notna().sum())
+                for fmt in self.supported_date_formats
+            ]
+            best = max(counts)
+            if best == 0:
+                return None, False
+            leaders = [fmt for fmt, count in zip(self.supported_date_formats, counts) if count == best]
+            if len(leaders) == 1:
+                return leaders[0], False
+            if len(scope) == len(values):
+                return leaders[0], True
+            scope = values
+    
+    def _parse_date_values(self, values: pd.Index, date_format: Optional[str] = None) -> np.ndarray:
+        """Parse distinct date strings with the given or inferred format
+        
+        A date_format of "" means no supported format fits and every value
+        goes through parse_date.
+        """
+        text = pd.Series(values.str.strip())
+        fmt = date_format
+        if fmt is None:
+            fmt, ambiguous = self.infer_date_format(text)
+            self.date_format = fmt
+            self.date_format_ambiguous = ambiguous
+            if ambiguous:
+                logger.warning(f"Ambiguous date format, assuming {fmt}")
+        
+        if fmt:
+            parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+        else:
+            parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+        
+        result = np.full(len(text), None, dtype=object)
+        found = parsed.notna().to_numpy()
+        result[found] = pd.DatetimeIndex(parsed[found]).to_pydatetime()
+        # Values in another format, or that pandas is stricter about than
+        # strptime (padding, year width), go through parse_date
+        result[~found] = [self.parse_date(value) for value in text[~found]]
+        return result
+    
+    def _parse_amount_values(self, values: pd.Index, decimal: str = '.') -> np.ndarray:
+        """Parse distinct amount strings the way parse_amount does"""
+        result = np.empty(len(values), dtype=object)
+        result[:] = [self._to_decimal(self._clean_amount(value, decimal)) for value in values]
+        return result
+    
+    @staticmethod
+    def _clean_description_values(values: pd.Index) -> np.ndarray:
+        """Clean distinct descriptions the way clean_description does"""
+        result = np.empty(len(values), dtype=object)
+        result[:] = [' '.join(value.split()).lower() for value in values]
+        return result
+    
+    def parse_dates(self, column: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+        """Column version of parse_date; unparseable values become None
+        
+        The format is inferred from the column unless date_format is given.
+        """
+        return self._parse_distinct(column, lambda values: self._parse_date_values(values, date_format))
+    
+    def parse_amounts(self, column: pd.Series, decimal: str = '.') -> pd.Series:
+        """Column version of parse_amount; unparseable values become None"""
+        return self._parse_distinct(column, lambda values: self._parse_amount_values(values, decimal))
+    
+    def clean_descriptions(self, column: pd.Series) -> pd.Series:
+        """Column version of clean_description"""
+        return self._parse_distinct(column, self._clean_description_values, missing="")
+    
+    def parse_frame(self, df: pd.DataFrame, date_col: str, amount_col: str, desc_col: str,
+                    date_format: Optional[str] = None, decimal: str = '.') -> Tuple[pd.DataFrame, pd.Series]:
+        """Parse the mapped columns of a CSV a whole column at a time
+        
+        Returns the parsed date, amount, description and reference columns
+        plus a boolean mask of rows rejected for a missing or unparseable
+        date, amount or description. A zero amount counts as missing.
+        """
+        parsed = pd.DataFrame({
+            "date": self.parse_dates(df[date_col], date_format),
+            "amount": self.parse_amounts(df[amount_col], decimal),
+            "description": self.clean_descriptions(df[desc_col])
+        }, index=df.index)
+        
+        # Missing references come back from pandas as NaN
+        if 'reference' in df.columns:
+            references = df['reference']
+            parsed["reference"] = references.astype(str).where(references.notna(), None)
+        else:
+            parsed["reference"] = None
+        
+        rejected = (parsed["date"].isna() | parsed["amount"].isna() | (parsed["amount"] == 0) |
+                    (parsed["description"] == ""))
+        return parsed, rejected
+    
+    @staticmethod
+    def _build_transactions(parsed: pd.DataFrame, rejected: pd.Series, source: str) -> List[Transaction]:
+        """Materialize transactions for the accepted rows of a parsed frame"""
+        accepted = parsed[~rejected]
+        # Dates and amounts are already typed, so skip Transaction's conversions
+        return Transaction.batch_from_parsed(
+            ids=[f"{source}_{idx}" for idx in accepted.index],
+            dates=accepted["date"].to_numpy(),
+            descriptions=accepted["description"].to_numpy(),
+            amounts=accepted["amount"].to_numpy(),
+            references=accepted["reference"].to_numpy(),
+            source=source
+        )
+    
+    def _column_mapping(self, format_info: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Date, amount and description column names from detected roles"""
+        date_col = format_info["date_column"]
+        amount_col = format_info["amount_column"] 
+        desc_col = format_info["description_column"]
+        
+        if not all([date_col, amount_col, desc_col]):
+            raise ValueError("Missing required columns (date, amount, description)")
+        return date_col, amount_col, desc_col
+    
+    @staticmethod
+    def _amount_decimal(format_info: Dict[str, Any]) -> str:
+        """Decimal separator of the amount column, rejecting files that mix them"""
+        if format_info["decimal"] is None:
+            raise ValueError("Amount column mixes decimal commas and decimal points")
+        return format_info["decimal"]
+    
     def process_csv(self, file_path: str, source: str = "unknown") -> List[Transaction]:
         """Process a CSV file and return list of transactions"""
-        transactions = []
-        
         try:
-            # Detect format
-            format_info = self.detect_csv_format(file_path)
-            if not format_info:
-                raise ValueError("Could not detect CSV format")
-            
-            # Read CSV
-            df = pd.read_csv(file_path)
-            
-            # Get column mappings
-            date_col = format_info["date_column"]
-            amount_col = format_info["amount_column"] 
-            desc_col = format_info["description_column"]
-            
-            if not all([date_col, amount_col, desc_col]):
-                raise ValueError("Missing required columns (date, amount, description)")
-            
-            # Process each row
-            for idx, row in df.iterrows():
-                try:
-                    # Parse date
-                    date = self.parse_date(row[date_col])
-                    if not date:
-                        continue
-                    
-                    # Parse amount
-                    amount = self.parse_amount(row[amount_col])
-                    if amount is None:
-                        continue
-                    
-                    # Clean description
-                    description = self.clean_description(row[desc_col])
-                    if not description:
-                        continue
-                    
-                    # Create transaction
-                    transaction = Transaction(
-                        id=f"{source}_{idx}",
-                        date=date,
-                        description=description,
-                        amount=amount,
-                        source=source,
-                        reference=str(row.get('reference', '')) if 'reference' in row else None
-                    )
-                    
-                    transactions.append(transaction)
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing row {idx}: {e}")
-                    continue
+            # Sniff and parse through a single open of the file
+            with open(file_path, "rb") as handle:
+                format_info = self.sniff_csv(handle)
+                self._column_mapping(format_info)
+                decimal = self._amount_decimal(format_info)
+                df = pd.read_csv(handle, **self._read_options(format_info))
+            
+            # Map again on the labels pandas assigned (duplicates get a suffix)
+            date_col, amount_col, desc_col = self._column_mapping(self._column_roles(df.columns.tolist()))
+            parsed, rejected = self.parse_frame(df, date_col, amount_col, desc_col, decimal=decimal)
+            self.rejected_rows = rejected
+            if rejected.any():
+                logger.warning(f"Skipped {int(rejected.sum())} of {len(df)} rows in {file_path}")
+            
+            transactions = self._build_transactions(parsed, rejected, source)
             
             logger.info(f"Processed {len(transactions)} transactions from {file_path}")
             return transactions
@@ -156,6 +445,143 @@ class CSVProcessor:
             logger.error(f"Error processing CSV file {file_path}: {e}")
             raise
     
+    def process_csv_table(self, file_path: str, source: str = "unknown") -> TransactionTable:
+        """Process a CSV file into a compact TransactionTable
+        
+        Same rows and ids as process_csv, without building a Transaction
+        object per row. table.rows() gives views the matcher and GUI accept.
+        """
+        try:
+            with open(file_path, "rb") as handle:
+                format_info = self.sniff_csv(handle)
+                self._column_mapping(format_info)
+                decimal = self._amount_decimal(format_info)
+                df = pd.read_csv(handle, **self._read_options(format_info))
+            
+            date_col, amount_col, desc_col = self._column_mapping(self._column_roles(df.columns.tolist()))
+            parsed, rejected = self.parse_frame(df, date_col, amount_col, desc_col, decimal=decimal)
+            self.rejected_rows = rejected
+            if rejected.any():
+                logger.warning(f"Skipped {int(rejected.sum())} of {len(df)} rows in {file_path}")
+            
+            accepted = parsed[~rejected]
+            table = TransactionTable(
+                ids=accepted.index.to_numpy(),
+                dates=accepted["date"].to_numpy(),
+                amounts=accepted["amount"].to_numpy(),
+                descriptions=accepted["description"].to_numpy(),
+                sources=[source] * len(accepted),
+                references=accepted["reference"].to_numpy(),
+                id_prefix=source
+            )
+            
+            logger.info(f"Processed {len(table)} transactions from {file_path}")
+            return table
+            
+        except Exception as e:
+            logger.error(f"Error processing CSV file {file_path}: {e}")
+            raise
+    
+    def iter_csv(self, file_path: str, source: str = "unknown",
+                 chunk_size: int = 50000) -> Iterator[List[Transaction]]:
+        """Stream a CSV file as batches of at most chunk_size transactions
+        
+        At most stream_hold_chunks chunks of the file are held as DataFrames
+        at a time, so ingest overhead stays flat however large the file is.
+        Batches hold the same rows, with the same ids, as process_csv returns
+        for the file. The date format is picked from the distinct dates in
+        the first chunks: as soon as they settle it, or from whatever they
+        show once stream_hold_chunks are held. It then stays fixed, so it
+        only differs from process_csv's when dates later in the file would
+        have broken a tie; dates that do not fit it still go through
+        parse_date. Batches can be chained straight into
+        TransactionMatcher.build_index. Rejected rows are counted rather
+        than kept as a mask.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        
+        try:
+            self.rejected_rows = None
+            date_format = None
+            # Chunks waiting for the date format, and the distinct date
+            # strings seen so far in order of first appearance
+            held: List[pd.DataFrame] = []
+            distinct_dates: Dict[str, None] = {}
+            counts = {"total": 0, "rejected": 0, "accepted": 0}
+            
+            def parse_chunk(chunk: pd.DataFrame) -> List[Transaction]:
+                date_col, amount_col, desc_col = self._column_mapping(self._column_roles(chunk.columns.tolist()))
+                parsed, rejected = self.parse_frame(chunk, date_col, amount_col, desc_col, date_format, decimal)
+                counts["total"] += len(chunk)
+                counts["rejected"] += int(rejected.sum())
+                batch = self._build_transactions(parsed, rejected, source)
+                counts["accepted"] += len(batch)
+                return batch
+            
+            with open(file_path, "rb") as handle:
+                format_info = self.sniff_csv(handle)
+                self._column_mapping(format_info)
+                decimal = self._amount_decimal(format_info)
+                with pd.read_csv(handle, chunksize=chunk_size, **self._read_options(format_info)) as reader:
+                    for chunk in reader:
+                        if date_format is None:
+                            held.append(chunk)
+                            date_col = self._column_mapping(self._column_roles(chunk.columns.tolist()))[0]
+                            column = chunk[date_col]
+                            distinct_dates.update(dict.fromkeys(column[self._present(column)].astype(str)))
+                            date_format = self._settled_date_format(
+                                list(distinct_dates), final=len(held) >= self.stream_hold_chunks
+                            )
+                            if date_format is None:
+                                continue
+                        ready, held = held or [chunk], []
+                        for ready_chunk in ready:
+                            batch = parse_chunk(ready_chunk)
+                            if batch:
+                                yield batch
+                    
+                    if held:
+                        date_format = self._settled_date_format(list(distinct_dates), final=True)
+                        for ready_chunk in held:
+                            batch = parse_chunk(ready_chunk)
+                            if batch:
+                                yield batch
+            
+            if counts["rejected"]:
+                logger.warning(f"Skipped {counts['rejected']} of {counts['total']} rows in {file_path}")
+            logger.info(f"Streamed {counts['accepted']} transactions from {file_path}")
+            
+        except Exception as e:
+            logger.error(f"Error processing CSV file {file_path}: {e}")
+            raise
+    
+    def _settled_date_format(self, distinct_dates: List[str], final: bool) -> Optional[str]:
+        """Date format process_csv would infer for a file, once it is certain
+        
+        distinct_dates are the file's distinct date strings so far, in order
+        of first appearance. Unless final is set (the file is read, or no
+        more of it may be held back), returns None while more of the file
+        could still change the answer. Otherwise returns the format to pass
+        to parse_frame ("" if no supported format fits, so values go through
+        parse_date one by one).
+        """
+        values = pd.Series([value.strip() for value in distinct_dates], dtype=object)
+        if not final:
+            if len(values) < self.date_sample_size:
+                return None
+            # process_csv rescores a tie on every distinct value
+            fmt, ambiguous = self.infer_date_format(values[:self.date_sample_size])
+            if ambiguous:
+                return None
+        else:
+            fmt, ambiguous = self.infer_date_format(values)
+        self.date_format = fmt
+        self.date_format_ambiguous = ambiguous
+        if ambiguous:
+            logger.warning(f"Ambiguous date format, assuming {fmt}")
+        return fmt or ""
+    
     def validate_transactions(self, transactions: List[Transaction]) -> Dict[str, Any]:
         """Validate processed transactions and return statistics"""
         if not transactions:
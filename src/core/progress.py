@@ -0,0 +1,100 @@
+"""
+Progress reporting and cancellation for long-running engine jobs
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+class ReconciliationCancelled(Exception):
+    """Raised inside a job whose CancellationToken has been cancelled"""
+
+
+class CancellationToken:
+    """Thread-safe flag a caller sets to stop a running job"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Ask the job to stop at its next progress check"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Raise ReconciliationCancelled once cancel() has been called"""
+        if self._event.is_set():
+            raise ReconciliationCancelled("Reconciliation cancelled")
+
+
+@dataclass
+class MatchProgress:
+    """Snapshot of a matching run"""
+    stage: str
+    rows_done: int
+    rows_total: int
+    pairs_scored: int
+    elapsed_seconds: float
+
+    @property
+    def fraction(self) -> float:
+        return self.rows_done / self.rows_total if self.rows_total else 1.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time extrapolated from the rows done so far"""
+        if not self.rows_done or self.rows_done >= self.rows_total:
+            return None
+        return self.elapsed_seconds * (self.rows_total - self.rows_done) / self.rows_done
+
+
+class ProgressReporter:
+    """Rate-limits progress callbacks and checks for cancellation
+
+    update() is cheap enough to call once per row: the callback runs at
+    most every interval seconds (plus forced stage changes) and is invoked
+    on the calling thread, so GUI callers must hand it to their event loop.
+    """
+
+    def __init__(self, callback: Optional[Callable[[MatchProgress], None]] = None,
+                 token: Optional[CancellationToken] = None, interval: float = 0.1):
+        self.callback = callback
+        self.token = token
+        self.interval = interval
+        self.stage = ""
+        self.rows_total = 0
+        self.started = time.monotonic()
+        self._last_report = float("-inf")
+
+    def start_stage(self, stage: str, rows_total: int):
+        """Begin a stage and report it immediately"""
+        self.stage = stage
+        self.rows_total = rows_total
+        self.update(0, 0, force=True)
+
+    def finish(self, pairs_scored: int):
+        """Report the job as complete"""
+        self.stage = "done"
+        self.update(self.rows_total, pairs_scored, force=True)
+
+    def update(self, rows_done: int, pairs_scored: int, force: bool = False):
+        """Report progress if the interval has passed; raise if cancelled"""
+        if self.token is not None:
+            self.token.raise_if_cancelled()
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_report >= self.interval:
+            self._last_report = now
+            self.callback(MatchProgress(
+                stage=self.stage,
+                rows_done=rows_done,
+                rows_total=self.rows_total,
+                pairs_scored=pairs_scored,
+                elapsed_seconds=now - self.started
+            ))
@@ -0,0 +1,421 @@
+"""
+Versioned binary snapshots of reconciliation sessions
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import weakref
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .models import ReconciliationResult, Match, Transaction, TransactionTable, _intern
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"RBSESSN\x00"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXTENSION = ".rbsession"
+
+# magic, format version, reserved flags, metadata length
+_HEADER = struct.Struct("<8sIIQ")
+# Arrays start on cache-line boundaries so they can be mapped in place
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.realpath(path))
+
+
+class StringPool(Sequence):
+    """Strings kept as one UTF-8 buffer plus offsets, decoded on first use"""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+        self._decoded: List[Optional[str]] = [None] * (len(offsets) - 1)
+
+    @staticmethod
+    def encode(strings: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Pack strings into (uint8 data, int64 offsets) arrays"""
+        encoded = [text.encode("utf-8") for text in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+    def __len__(self) -> int:
+        return len(self._decoded)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        text = self._decoded[index]
+        if text is None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            text = self._decoded[index] = self._data[start:end].tobytes().decode("utf-8")
+        return text
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class _MappedSnapshot:
+    """A memory-mapped session file and the tables and pools using it in place"""
+
+    # TransactionTable attributes that may hold arrays over the mapping
+    TABLE_ARRAYS = ("days", "cents", "_labels") + tuple(
+        codes for codes, _ in TransactionTable.TEXT_COLUMNS.values()
+    )
+
+    def __init__(self, mapped: mmap.mmap):
+        self.mapped = mapped
+        self.tables: List[weakref.ref] = []
+        self.pools: List[weakref.ref] = []
+
+    def release(self):
+        """Copy the mapped data into memory and close the mapping
+
+        Tables and pools loaded from the file keep working from the copies.
+        """
+        for ref in self.pools:
+            pool = ref()
+            if pool is not None:
+                pool._data = pool._data.copy()
+                pool._offsets = pool._offsets.copy()
+        for ref in self.tables:
+            table = ref()
+            if table is None:
+                continue
+            for name in self.TABLE_ARRAYS:
+                if isinstance(getattr(table, name), np.ndarray):
+                    setattr(table, name, getattr(table, name).copy())
+        try:
+            self.mapped.close()
+        except BufferError:
+            logger.warning("A session file is still viewed elsewhere and stays mapped")
+
+
+# Session files this process has mapped, by normalized path
+_mapped_snapshots: Dict[str, List[_MappedSnapshot]] = {}
+
+
+def _release_mappings(path: str):
+    """Stop mapping a session file before it is replaced
+
+    Windows refuses to replace a file that is mapped, which would stop a
+    session from being saved back over the file it was opened from.
+    """
+    for snapshot in _mapped_snapshots.pop(_path_key(path), []):
+        snapshot.release()
+
+
+class _SnapshotWriter:
+    """Collects named arrays and lays them out after the metadata"""
+
+    def __init__(self):
+        self.arrays: List[Tuple[str, np.ndarray]] = []
+
+    def add(self, name: str, array: np.ndarray) -> str:
+        self.arrays.append((name, np.ascontiguousarray(array)))
+        return name
+
+    def add_strings(self, name: str, strings: Iterable[str]) -> Dict[str, str]:
+        data, offsets = StringPool.encode(strings)
+        return {"data": self.add(f"{name}.data", data), "offsets": self.add(f"{name}.offsets", offsets)}
+
+    def add_table(self, side: str, table: TransactionTable) -> Dict[str, Any]:
+        """Store a TransactionTable and return its metadata entry"""
+        columns = table.to_arrays()
+        entry: Dict[str, Any] = {
+            "rows": len(table),
+            "id_prefix": columns["id_prefix"],
+            "days": self.add(f"{side}.days", columns["days"]),
+            "cents": self.add(f"{side}.cents", columns["cents"]),
+            "exact_dates": [
+                [row, date.isoformat() if date is not None else None]
+                for row, date in columns["exact_dates"].items()
+            ],
+            "exact_amounts": [[row, str(amount)] for row, amount in columns["exact_amounts"].items()]
+        }
+        if columns["id_prefix"] is None:
+            entry["ids"] = self.add_strings(f"{side}.ids", columns["ids"])
+        else:
+            entry["ids"] = self.add(f"{side}.ids", columns["ids"])
+        for name in TransactionTable.TEXT_COLUMNS:
+            entry[f"{name}_codes"] = self.add(f"{side}.{name}_codes", columns[f"{name}_codes"])
+            entry[f"{name}_pool"] = self.add_strings(f"{side}.{name}_pool", columns[f"{name}_pool"])
+        return entry
+
+    def write(self, path: str, meta: Dict[str, Any]):
+        """Write header, metadata and arrays, replacing path atomically"""
+        layout = {}
+        offset = 0
+        for name, array in self.arrays:
+            offset = _align(offset)
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += array.nbytes
+        meta = dict(meta, arrays=layout)
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        data_start = _align(_HEADER.size + len(meta_bytes))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        handle = tempfile.NamedTemporaryFile(dir=directory, prefix=".session-", delete=False)
+        try:
+            with handle:
+                handle.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(meta_bytes)))
+                handle.write(meta_bytes)
+                for name, array in self.arrays:
+                    handle.write(b"\0" * (data_start + layout[name]["offset"] - handle.tell()))
+                    handle.write(array.tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+            # Writing to a fresh file and renaming means a failed save never
+            # leaves a half-written session; this process's own mappings of
+            # path are released first (see _release_mappings)
+            try:
+                os.replace(handle.name, path)
+            except PermissionError as e:
+                raise ValueError(
+                    f"Could not overwrite {path}; it is open in another program. "
+                    "Close it there or save the session under another name."
+                ) from e
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+
+
+def matcher_settings(matcher) -> Dict[str, Any]:
+    """The TransactionMatcher settings worth restoring with a session"""
+    return matcher.scoring_settings()
+
+
+def apply_matcher_settings(matcher, settings: Dict[str, Any]):
+    """Restore settings saved by matcher_settings onto a TransactionMatcher"""
+    if "confidence_threshold" in settings:
+        matcher.confidence_threshold = settings["confidence_threshold"]
+    if "date_tolerance_days" in settings:
+        matcher.date_tolerance_days = settings["date_tolerance_days"]
+    if "amount_tolerance" in settings:
+        matcher.amount_tolerance = Decimal(settings["amount_tolerance"])
+    if "weights" in settings:
+        matcher.weights = dict(settings["weights"])
+
+
+def _row_positions(transactions: List[Transaction]) -> Dict[Any, int]:
+    """Lookup from transaction (by identity, then id) to its row"""
+    positions: Dict[Any, int] = {}
+    for row, tx in enumerate(transactions):
+        positions.setdefault(("id", tx.id), row)
+        positions[id(tx)] = row
+    return positions
+
+
+def _row_of(positions: Dict[Any, int], tx: Transaction) -> int:
+    row = positions.get(id(tx))
+    if row is None:
+        row = positions.get(("id", tx.id))
+    if row is None:
+        raise ValueError(f"Transaction {tx.id} is not part of the session")
+    return row
+
+
+def encode_result(result: ReconciliationResult) -> Dict[str, Any]:
+    """A result's matches and unmatched rows as row numbers into its transaction lists
+
+    Transactions are found by identity, falling back to their id. This is
+    the form results take in session snapshots and between processes;
+    decode_result reverses it.
+    """
+    positions = {
+        "bank": _row_positions(result.bank_transactions),
+        "quickbooks": _row_positions(result.quickbooks_transactions)
+    }
+    reason_codes, reason_pool = _intern(m.match_reason for m in result.matches)
+    return {
+        "bank_rows": np.array(
+            [_row_of(positions["bank"], m.bank_transaction) for m in result.matches], dtype=np.int64
+        ),
+        "quickbooks_rows": np.array(
+            [_row_of(positions["quickbooks"], m.quickbooks_transaction) for m in result.matches], dtype=np.int64
+        ),
+        "confidence": np.array([m.confidence_score for m in result.matches], dtype=np.float64),
+        "reason_codes": reason_codes,
+        "reason_pool": reason_pool,
+        "unmatched_bank": np.array(
+            [_row_of(positions["bank"], tx) for tx in result.unmatched_bank], dtype=np.int64
+        ),
+        "unmatched_quickbooks": np.array(
+            [_row_of(positions["quickbooks"], tx) for tx in result.unmatched_quickbooks], dtype=np.int64
+        ),
+        "confidence_threshold": result.confidence_threshold,
+        "scoring_settings": result.scoring_settings
+    }
+
+
+def decode_result(encoded: Dict[str, Any], bank_transactions: List[Transaction],
+                  quickbooks_transactions: List[Transaction]) -> ReconciliationResult:
+    """Rebuild an encode_result over the given transaction lists"""
+    reasons = encoded["reason_pool"]
+    matches = [
+        Match(
+            bank_transaction=bank_transactions[bank_row],
+            quickbooks_transaction=quickbooks_transactions[qb_row],
+            confidence_score=confidence,
+            match_reason=reasons[reason]
+        )
+        for bank_row, qb_row, confidence, reason in zip(
+            encoded["bank_rows"].tolist(),
+            encoded["quickbooks_rows"].tolist(),
+            encoded["confidence"].tolist(),
+            encoded["reason_codes"].tolist()
+        )
+    ]
+    unmatched_bank = [bank_transactions[row] for row in encoded["unmatched_bank"].tolist()]
+    unmatched_qb = [quickbooks_transactions[row] for row in encoded["unmatched_quickbooks"].tolist()]
+    return ReconciliationResult(
+        bank_transactions=bank_transactions,
+        quickbooks_transactions=quickbooks_transactions,
+        matches=matches,
+        unmatched_bank=unmatched_bank,
+        unmatched_quickbooks=unmatched_qb,
+        total_matched=len(matches),
+        total_unmatched=len(unmatched_bank) + len(unmatched_qb),
+        confidence_threshold=encoded["confidence_threshold"],
+        scoring_settings=encoded["scoring_settings"]
+    )
+
+
+def save_session(result: ReconciliationResult, path: str, settings: Optional[Dict[str, Any]] = None):
+    """Write a reconciliation result to a binary session snapshot
+
+    Transactions are stored column-wise (see TransactionTable), matches as
+    row numbers, scores and interned reasons. settings (for example
+    matcher_settings(matcher)) are stored alongside as JSON.
+    """
+    encoded = encode_result(result)
+    writer = _SnapshotWriter()
+    meta: Dict[str, Any] = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "confidence_threshold": encoded["confidence_threshold"],
+        "scoring_settings": encoded["scoring_settings"],
+        "settings": settings or {},
+        "tables": {}
+    }
+
+    sides = {"bank": result.bank_transactions, "quickbooks": result.quickbooks_transactions}
+    for side, transactions in sides.items():
+        meta["tables"][side] = writer.add_table(side, TransactionTable.from_transactions(transactions))
+        meta["tables"][side]["unmatched"] = writer.add(f"{side}.unmatched", encoded[f"unmatched_{side}"])
+
+    meta["matches"] = {
+        "count": len(result.matches),
+        "bank_rows": writer.add("matches.bank_rows", encoded["bank_rows"]),
+        "quickbooks_rows": writer.add("matches.quickbooks_rows", encoded["quickbooks_rows"]),
+        "confidence": writer.add("matches.confidence", encoded["confidence"]),
+        "reason_codes": writer.add("matches.reason_codes", encoded["reason_codes"]),
+        "reason_pool": writer.add_strings("matches.reason_pool", encoded["reason_pool"])
+    }
+
+    _release_mappings(path)
+    writer.write(path, meta)
+    logger.info(f"Saved session with {len(result.matches)} matches to {path}")
+
+
+def _read_header(mapped) -> Tuple[Dict[str, Any], int]:
+    """Validate the header and return the metadata and data section start"""
+    if len(mapped) < _HEADER.size:
+        raise ValueError("Not a session snapshot (file too short)")
+    magic, version, _, meta_length = _HEADER.unpack_from(mapped, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a session snapshot")
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"Session snapshot version {version} is newer than supported ({SNAPSHOT_VERSION})")
+    meta = json.loads(bytes(mapped[_HEADER.size:_HEADER.size + meta_length]).decode("utf-8"))
+    return meta, _align(_HEADER.size + meta_length)
+
+
+def read_session_info(path: str) -> Dict[str, Any]:
+    """Metadata of a session snapshot (version, thresholds, settings, sizes)"""
+    with open(path, "rb") as handle:
+        prefix = handle.read(_HEADER.size)
+        if len(prefix) == _HEADER.size:
+            prefix += handle.read(_HEADER.unpack(prefix)[3])
+    meta, _ = _read_header(prefix)
+    meta.pop("arrays", None)
+    return meta
+
+
+def load_session(path: str) -> Tuple[ReconciliationResult, Dict[str, Any]]:
+    """Open a session snapshot; returns the result and the saved settings
+
+    The file is memory-mapped and numeric columns are used in place, so
+    only match objects and lightweight row views are created up front.
+    The mapping stays open until save_session writes to the same path,
+    which first copies the data into memory.
+    """
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    snapshot = _MappedSnapshot(mapped)
+    meta, data_start = _read_header(mapped)
+    layout = meta["arrays"]
+
+    def array(name: str) -> np.ndarray:
+        spec = layout[name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        if count == 0:
+            return np.empty(spec["shape"], dtype=dtype)
+        return np.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + spec["offset"]).reshape(spec["shape"])
+
+    def strings(entry: Dict[str, str]) -> StringPool:
+        pool = StringPool(array(entry["data"]), array(entry["offsets"]))
+        snapshot.pools.append(weakref.ref(pool))
+        return pool
+
+    rows = {}
+    for side, entry in meta["tables"].items():
+        columns = {
+            "id_prefix": entry["id_prefix"],
+            "ids": strings(entry["ids"]) if entry["id_prefix"] is None else array(entry["ids"]),
+            "days": array(entry["days"]),
+            "cents": array(entry["cents"]),
+            "exact_dates": {
+                row: datetime.fromisoformat(date) if date is not None else None
+                for row, date in entry["exact_dates"]
+            },
+            "exact_amounts": {row: Decimal(amount) for row, amount in entry["exact_amounts"]}
+        }
+        for name in TransactionTable.TEXT_COLUMNS:
+            columns[f"{name}_codes"] = array(entry[f"{name}_codes"])
+            columns[f"{name}_pool"] = strings(entry[f"{name}_pool"])
+        table = TransactionTable.from_arrays(columns)
+        snapshot.tables.append(weakref.ref(table))
+        rows[side] = table.rows()
+
+    match_meta = meta["matches"]
+    result = decode_result({
+        "bank_rows": array(match_meta["bank_rows"]),
+        "quickbooks_rows": array(match_meta["quickbooks_rows"]),
+        "confidence": array(match_meta["confidence"]),
+        "reason_codes": array(match_meta["reason_codes"]),
+        "reason_pool": strings(match_meta["reason_pool"]),
+        "unmatched_bank": array(meta["tables"]["bank"]["unmatched"]),
+        "unmatched_quickbooks": array(meta["tables"]["quickbooks"]["unmatched"]),
+        "confidence_threshold": meta["confidence_threshold"],
+        "scoring_settings": meta.get("scoring_settings")
+    }, rows["bank"], rows["quickbooks"])
+    _mapped_snapshots.setdefault(_path_key(path), []).append(snapshot)
+    logger.info(f"Opened session with {len(result.matches)} matches from {path}")
+    return result, meta["settings"]
@@ -0,0 +1,26 @@
+"""
+Description normalization shared by the matcher and its indexes
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Common words that don't help matching
+COMMON_WORDS = frozenset({'the', 'and', 'or', 'of', 'for', 'with', 'by', 'in', 'on', 'at', 'to', 'from'})
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Normalized form of a description: (lowercased text, significant words joined by spaces)
+NormalizedDescription = Tuple[str, str]
+
+
+@lru_cache(maxsize=65536)
+def normalize_description(text: str) -> Optional[NormalizedDescription]:
+    """Normalize and tokenize a description once; None for empty text"""
+    if not text:
+        return None
+
+    text = text.lower().strip()
+    words = [w for w in WORD_PATTERN.findall(text) if w not in COMMON_WORDS]
+    return text, ' '.join(words)
@@ -4,13 +4,14 @@ Main application window for the reconciliation tool
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-import threading
 from pathlib import Path
+from typing import Any, Callable, Optional
 import logging
 
-from ..core.processor import CSVProcessor
-from ..core.matcher import TransactionMatcher
-from ..utils.pdf_generator import PDFGenerator
+from ..core.engine import EngineClient, table_payload, rows_from_payload
+from ..core.progress import MatchProgress
+from ..core.session import (SNAPSHOT_EXTENSION, encode_result, decode_result, matcher_settings,
+                            apply_matcher_settings)
 from .file_upload import FileUploadFrame
 from .transaction_view import TransactionViewFrame
 
@@ -24,15 +25,24 @@ class ReconciliationApp:
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         
-        # Initialize components
-        self.processor = CSVProcessor()
-        self.matcher = TransactionMatcher()
-        self.pdf_generator = PDFGenerator()
+        # Initialize components. Ingest, matching and reporting run in the
+        # engine process; the matcher here only carries the settings sent
+        # with each run and is created on first use (see matcher).
+        self.engine = EngineClient()
+        self._matcher = None
+        # Handlers of engine jobs still in flight, by job id
+        self.engine_jobs = {}
+        self.engine_poll_ms = 50
+        # How long a cancelled run may keep going before the engine is restarted
+        self.kill_timeout_ms = 5000
         
         # Data storage
         self.bank_transactions = []
         self.quickbooks_transactions = []
         self.reconciliation_result = None
+        # Engine job id while a reconciliation runs
+        self.reconcile_job = None
+        self.cancel_requested = False
         
         # Create main window
         self.root = ctk.CTk()
@@ -42,6 +52,16 @@ class ReconciliationApp:
         
         self.setup_ui()
         self.setup_menu()
+        self.root.after(self.engine_poll_ms, self.poll_engine)
+    
+    @property
+    def matcher(self):
+        """Matcher holding the settings for reconciliation runs"""
+        if self._matcher is None:
+            # Deferred: the matcher stack (difflib, kernels) is not needed for the first window
+            from ..core.matcher import TransactionMatcher
+            self._matcher = TransactionMatcher()
+        return self._matcher
     
     def setup_ui(self):
         """Setup the main user interface"""
@@ -70,6 +90,20 @@ class ReconciliationApp:
         )
         self.status_label.grid(row=0, column=1, padx=20, pady=10, sticky="e")
         
+        # Reconciliation progress, shown only while a run is active
+        self.progress_bar = ctk.CTkProgressBar(header_frame, width=200)
+        self.progress_bar.grid(row=0, column=2, padx=(0, 10), pady=10)
+        self.progress_bar.grid_remove()
+        
+        self.cancel_button = ctk.CTkButton(
+            header_frame,
+            text="Cancel",
+            command=self.cancel_reconciliation,
+            width=80
+        )
+        self.cancel_button.grid(row=0, column=3, padx=(0, 20), pady=10)
+        self.cancel_button.grid_remove()
+        
         # Main content area
         main_frame = ctk.CTkFrame(self.root)
         main_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
@@ -94,6 +128,8 @@ class ReconciliationApp:
         button_frame.grid_columnconfigure(0, weight=1)
         button_frame.grid_columnconfigure(1, weight=1)
         button_frame.grid_columnconfigure(2, weight=1)
+        button_frame.grid_columnconfigure(3, weight=1)
+        button_frame.grid_columnconfigure(4, weight=1)
         
         # Run reconciliation button
         self.reconcile_button = ctk.CTkButton(
@@ -113,6 +149,22 @@ class ReconciliationApp:
         )
         self.export_button.grid(row=0, column=1, padx=10, pady=10)
         
+        # Session buttons
+        self.save_session_button = ctk.CTkButton(
+            button_frame,
+            text="Save Session",
+            command=self.save_session,
+            state="disabled"
+        )
+        self.save_session_button.grid(row=0, column=2, padx=10, pady=10)
+        
+        self.open_session_button = ctk.CTkButton(
+            button_frame,
+            text="Open Session",
+            command=self.open_session
+        )
+        self.open_session_button.grid(row=0, column=3, padx=10, pady=10)
+        
         # Clear data button
         self.clear_button = ctk.CTkButton(
             button_frame,
@@ -121,7 +173,7 @@ class ReconciliationApp:
             fg_color="red",
             hover_color="darkred"
         )
-        self.clear_button.grid(row=0, column=2, padx=10, pady=10)
+        self.clear_button.grid(row=0, column=4, padx=10, pady=10)
     
     def setup_menu(self):
         """Setup application menu"""
@@ -148,48 +200,123 @@ class ReconciliationApp:
         )
         help_button.pack(side="right", padx=5)
     
-    def on_bank_file_selected(self, file_path: str):
-        """Handle bank file selection"""
+    def run_engine_job(self, kind: str, on_result: Callable[[Any], None],
+                       on_error: Callable[[str], None],
+                       on_progress: Optional[Callable[[MatchProgress], None]] = None,
+                       on_cancelled: Optional[Callable[[], None]] = None, **params) -> int:
+        """Send a job to the engine process; handlers run on the Tk thread"""
+        job_id = self.engine.submit(kind, **params)
+        self.engine_jobs[job_id] = {
+            "result": on_result,
+            "error": on_error,
+            "progress": on_progress,
+            "cancelled": on_cancelled
+        }
+        return job_id
+    
+    def poll_engine(self):
+        """Dispatch messages from the engine process, then poll again
+        
+        A handler that raises is logged and does not stop polling.
+        """
         try:
-            self.status_label.configure(text="Processing bank file...")
-            self.root.update()
-            
-            # Process in thread to avoid blocking UI
-            def process_file():
+            for message in self.engine.poll():
+                # Jobs dropped by clear_data have no handlers any more
+                handlers = self.engine_jobs.get(message.job_id)
+                if handlers is None:
+                    continue
+                if message.kind != "progress":
+                    del self.engine_jobs[message.job_id]
                 try:
-                    self.bank_transactions = self.processor.process_csv(file_path, "bank")
-                    self.root.after(0, self.on_file_processed, "bank")
-                except Exception as e:
-                    self.root.after(0, self.on_file_error, str(e))
+                    self.dispatch_engine_message(handlers, message)
+                except Exception:
+                    logger.exception(f"Handling {message.kind} of engine job {message.job_id} failed")
             
-            threading.Thread(target=process_file, daemon=True).start()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to process bank file: {e}")
-            self.status_label.configure(text="Ready to import files")
+            if not self.engine.alive:
+                logger.warning("Engine process exited; starting a new one")
+                self.restart_engine()
+        finally:
+            self.root.after(self.engine_poll_ms, self.poll_engine)
+    
+    @staticmethod
+    def dispatch_engine_message(handlers: dict, message):
+        """Call the handler registered for an engine message's kind"""
+        if message.kind == "progress":
+            if handlers["progress"] is not None:
+                handlers["progress"](message.payload)
+        elif message.kind == "cancelled":
+            if handlers["cancelled"] is not None:
+                handlers["cancelled"]()
+            else:
+                handlers["error"]("Cancelled")
+        else:
+            handlers[message.kind](message.payload)
+    
+    def restart_engine(self):
+        """Replace the engine process, keeping the data the window holds"""
+        for job_id in self.engine.restart():
+            handlers = self.engine_jobs.pop(job_id, None)
+            if handlers is None:
+                continue
+            if handlers["cancelled"] is not None:
+                handlers["cancelled"]()
+            else:
+                handlers["error"]("The engine was restarted before the job finished")
+        
+        # The new engine starts empty
+        if self.bank_transactions or self.quickbooks_transactions:
+            self.run_engine_job(
+                "load_state",
+                on_result=lambda _: None,
+                on_error=self.on_engine_error,
+                bank=table_payload(self.bank_transactions),
+                quickbooks=table_payload(self.quickbooks_transactions),
+                result=encode_result(self.reconciliation_result) if self.reconciliation_result else None
+            )
+    
+    def on_engine_error(self, error_message: str):
+        """Handle an engine failure outside a specific user action"""
+        messagebox.showerror("Engine Error", error_message)
+    
+    def on_bank_file_selected(self, file_path: str):
+        """Handle bank file selection"""
+        self.process_file(file_path, "bank")
     
     def on_quickbooks_file_selected(self, file_path: str):
         """Handle QuickBooks file selection"""
+        self.process_file(file_path, "quickbooks")
+    
+    def process_file(self, file_path: str, file_type: str):
+        """Have the engine ingest a CSV file"""
         try:
-            self.status_label.configure(text="Processing QuickBooks file...")
-            self.root.update()
-            
-            # Process in thread to avoid blocking UI
-            def process_file():
-                try:
-                    self.quickbooks_transactions = self.processor.process_csv(file_path, "quickbooks")
-                    self.root.after(0, self.on_file_processed, "quickbooks")
-                except Exception as e:
-                    self.root.after(0, self.on_file_error, str(e))
+            label = "bank" if file_type == "bank" else "QuickBooks"
+            self.status_label.configure(text=f"Processing {label} file...")
             
-            threading.Thread(target=process_file, daemon=True).start()
+            self.run_engine_job(
+                "process_csv",
+                on_result=lambda payload: self.on_file_processed(file_type, payload),
+                on_error=self.on_file_error,
+                path=file_path,
+                source=file_type
+            )
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to process QuickBooks file: {e}")
+            messagebox.showerror("Error", f"Failed to process {label} file: {e}")
             self.status_label.configure(text="Ready to import files")
     
-    def on_file_processed(self, file_type: str):
+    def on_file_processed(self, file_type: str, payload: dict):
         """Handle successful file processing"""
+        transactions = rows_from_payload(payload)
+        if file_type == "bank":
+            self.bank_transactions = transactions
+        else:
+            self.quickbooks_transactions = transactions
+        
+        # The engine drops its result when a file changes
+        self.reconciliation_result = None
+        self.export_button.configure(state="disabled")
+        self.save_session_button.configure(state="disabled")
+        
         self.status_label.configure(text=f"{file_type.title()} file processed successfully")
         
         # Update file upload display
@@ -214,31 +341,77 @@ class ReconciliationApp:
         try:
             self.status_label.configure(text="Running reconciliation...")
             self.reconcile_button.configure(state="disabled")
-            self.root.update()
+            self.progress_bar.set(0)
+            self.progress_bar.grid()
+            self.cancel_button.configure(state="normal")
+            self.cancel_button.grid()
             
-            # Run in thread to avoid blocking UI
-            def reconcile():
-                try:
-                    self.reconciliation_result = self.matcher.find_matches(
-                        self.bank_transactions, 
-                        self.quickbooks_transactions
-                    )
-                    self.root.after(0, self.on_reconciliation_complete)
-                except Exception as e:
-                    self.root.after(0, self.on_reconciliation_error, str(e))
-            
-            threading.Thread(target=reconcile, daemon=True).start()
+            self.cancel_requested = False
+            self.reconcile_job = self.run_engine_job(
+                "find_matches",
+                on_result=self.on_reconciliation_complete,
+                on_error=self.on_reconciliation_error,
+                on_progress=self.on_reconciliation_progress,
+                on_cancelled=self.on_reconciliation_cancelled,
+                settings=matcher_settings(self.matcher)
+            )
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to run reconciliation: {e}")
+            self.end_reconciliation_run()
             self.status_label.configure(text="Ready to reconcile")
-            self.reconcile_button.configure(state="normal")
     
-    def on_reconciliation_complete(self):
+    def on_reconciliation_progress(self, progress: MatchProgress):
+        """Show progress of the running reconciliation"""
+        # Updates still in flight after Cancel would overwrite its status
+        if self.cancel_requested:
+            return
+        
+        self.progress_bar.set(progress.fraction)
+        text = (f"{progress.stage.title()}: {progress.rows_done:,}/{progress.rows_total:,} rows, "
+                f"{progress.pairs_scored:,} pairs scored")
+        if progress.eta_seconds is not None:
+            text += f", about {progress.eta_seconds:.0f}s left"
+        self.status_label.configure(text=text)
+    
+    def cancel_reconciliation(self):
+        """Ask the running reconciliation to stop, restarting the engine if it does not"""
+        if self.reconcile_job is None:
+            return
+        
+        self.engine.cancel(self.reconcile_job)
+        self.cancel_requested = True
+        self.cancel_button.configure(state="disabled")
+        self.status_label.configure(text="Cancelling reconciliation...")
+        self.root.after(self.kill_timeout_ms, self.kill_stuck_run, self.reconcile_job)
+    
+    def kill_stuck_run(self, job_id: int):
+        """Restart the engine if a cancelled run is still going"""
+        if job_id in self.engine.pending:
+            logger.warning("Reconciliation did not stop after cancel; restarting the engine")
+            self.restart_engine()
+    
+    def end_reconciliation_run(self):
+        """Hide the progress controls after a run ends"""
+        self.reconcile_job = None
+        self.progress_bar.grid_remove()
+        self.cancel_button.grid_remove()
+        self.reconcile_button.configure(state="normal")
+    
+    def on_reconciliation_cancelled(self):
+        """Handle a cancelled reconciliation"""
+        self.end_reconciliation_run()
+        self.status_label.configure(text="Reconciliation cancelled")
+    
+    def on_reconciliation_complete(self, payload: dict):
         """Handle successful reconciliation"""
+        self.reconciliation_result = decode_result(
+            payload, self.bank_transactions, self.quickbooks_transactions
+        )
+        self.end_reconciliation_run()
         self.status_label.configure(text="Reconciliation complete")
-        self.reconcile_button.configure(state="normal")
         self.export_button.configure(state="normal")
+        self.save_session_button.configure(state="normal")
         
         # Update transaction view
         self.transaction_view.update_data(self.reconciliation_result)
@@ -256,9 +429,9 @@ class ReconciliationApp:
     
     def on_reconciliation_error(self, error_message: str):
         """Handle reconciliation error"""
+        self.end_reconciliation_run()
         messagebox.showerror("Reconciliation Error", error_message)
         self.status_label.configure(text="Ready to reconcile")
-        self.reconcile_button.configure(state="normal")
     
     def export_pdf(self):
         """Export reconciliation results to PDF"""
@@ -275,20 +448,12 @@ class ReconciliationApp:
             
             if file_path:
                 self.status_label.configure(text="Generating PDF report...")
-                self.root.update()
-                
-                # Generate in thread
-                def generate_pdf():
-                    try:
-                        self.pdf_generator.generate_report(
-                            self.reconciliation_result, 
-                            file_path
-                        )
-                        self.root.after(0, self.on_pdf_exported, file_path)
-                    except Exception as e:
-                        self.root.after(0, self.on_pdf_error, str(e))
-                
-                threading.Thread(target=generate_pdf, daemon=True).start()
+                self.run_engine_job(
+                    "generate_report",
+                    on_result=lambda _: self.on_pdf_exported(file_path),
+                    on_error=self.on_pdf_error,
+                    path=file_path
+                )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export PDF: {e}")
@@ -307,9 +472,97 @@ class ReconciliationApp:
         messagebox.showerror("Export Error", error_message)
         self.status_label.configure(text="Ready to export")
     
+    def save_session(self):
+        """Save the reconciliation result and matcher settings to a session file"""
+        if not self.reconciliation_result:
+            messagebox.showwarning("Warning", "No reconciliation results to save")
+            return
+        
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=SNAPSHOT_EXTENSION,
+                filetypes=[("ReconcileBook sessions", f"*{SNAPSHOT_EXTENSION}")],
+                title="Save Session"
+            )
+            
+            if file_path:
+                self.status_label.configure(text="Saving session...")
+                self.run_engine_job(
+                    "save_session",
+                    on_result=lambda _: self.on_session_saved(file_path),
+                    on_error=self.on_session_error,
+                    path=file_path,
+                    settings=matcher_settings(self.matcher)
+                )
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save session: {e}")
+            self.status_label.configure(text="Ready")
+    
+    def on_session_saved(self, file_path: str):
+        """Handle successful session save"""
+        self.status_label.configure(text=f"Session saved to {Path(file_path).name}")
+    
+    def open_session(self):
+        """Load a previously saved session"""
+        try:
+            file_path = filedialog.askopenfilename(
+                filetypes=[("ReconcileBook sessions", f"*{SNAPSHOT_EXTENSION}"), ("All files", "*.*")],
+                title="Open Session"
+            )
+            
+            if file_path:
+                self.status_label.configure(text="Opening session...")
+                self.root.update()
+                
+                # The engine loads the file and sends the data back, so the
+                # window only changes once the engine holds the same session
+                self.run_engine_job(
+                    "open_session",
+                    on_result=lambda payload: self.on_session_opened(file_path, payload),
+                    on_error=self.on_session_error,
+                    path=file_path
+                )
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open session: {e}")
+            self.status_label.configure(text="Ready")
+    
+    def on_session_opened(self, file_path: str, payload: dict):
+        """Show a session the engine has loaded and restore its matcher settings"""
+        self.bank_transactions = rows_from_payload(payload["bank"])
+        self.quickbooks_transactions = rows_from_payload(payload["quickbooks"])
+        result = decode_result(payload["result"], self.bank_transactions, self.quickbooks_transactions)
+        self.reconciliation_result = result
+        settings = payload["settings"]
+        
+        self.matcher.confidence_threshold = result.confidence_threshold
+        apply_matcher_settings(self.matcher, settings)
+        
+        self.file_upload.update_file_status("bank", True)
+        self.file_upload.update_file_status("quickbooks", True)
+        self.transaction_view.update_data(result)
+        
+        self.reconcile_button.configure(state="normal")
+        self.export_button.configure(state="normal")
+        self.save_session_button.configure(state="normal")
+        self.status_label.configure(text=f"Session opened from {Path(file_path).name}")
+    
+    def on_session_error(self, error_message: str):
+        """Handle session save/open error"""
+        messagebox.showerror("Session Error", error_message)
+        self.status_label.configure(text="Ready")
+    
     def clear_data(self):
         """Clear all loaded data"""
         if messagebox.askyesno("Clear Data", "Are you sure you want to clear all data?"):
+            if self.reconcile_job is not None:
+                self.cancel_reconciliation()
+                self.end_reconciliation_run()
+            # Results still in flight belong to the data being cleared
+            self.engine_jobs.clear()
+            self.run_engine_job("clear", on_result=lambda _: None, on_error=self.on_engine_error)
+            
             self.bank_transactions = []
             self.quickbooks_transactions = []
             self.reconciliation_result = None
@@ -319,6 +572,7 @@ class ReconciliationApp:
             
             self.reconcile_button.configure(state="disabled")
             self.export_button.configure(state="disabled")
+            self.save_session_button.configure(state="disabled")
             
             self.status_label.configure(text="Ready to import files")
     
@@ -338,12 +592,17 @@ ReconcileBook Desktop - Help
 
 2. Run Reconciliation:
    - Click "Run Reconciliation" to match transactions
+   - Watch progress in the header; click "Cancel" to stop a long run
    - Review matches and confidence scores
 
 3. Export Report:
    - Click "Export PDF Report" to save results
 
-4. Supported Formats:
+4. Sessions:
+   - Click "Save Session" to keep results and settings for later
+   - Click "Open Session" to reload them without re-running
+
+5. Supported Formats:
    - CSV files with date, amount, and description columns
    - Common date formats: YYYY-MM-DD, MM/DD/YYYY, DD/MM/YYYY
 
@@ -353,4 +612,7 @@ For more help, visit: reconcilebook.com
     
     def run(self):
         """Start the application"""
-        self.root.mainloop() 
\ No newline at end of file
+        try:
+            self.root.mainloop()
+        finally:
+            self.engine.shutdown() 
\ No newline at end of file
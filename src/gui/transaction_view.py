@@ -4,11 +4,15 @@ Transaction view widget for displaying reconciliation results
 
 import customtkinter as ctk
 from tkinter import ttk
-from typing import List, Optional
-import pandas as pd
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import logging
+import queue
+import threading
 
 from ..core.models import ReconciliationResult, Match
 
+logger = logging.getLogger(__name__)
+
 class TransactionViewFrame(ctk.CTkFrame):
     """Widget for displaying transaction reconciliation results"""
     
@@ -18,6 +22,22 @@ class TransactionViewFrame(ctk.CTkFrame):
         self.reconciliation_result = None
         self.current_view = "matches"  # matches, unmatched_bank, unmatched_qb
         
+        # Rows of the current view and how to turn one into tree values
+        self.rows: Sequence[Any] = []
+        self.row_formatter: Optional[Callable[[Any], Tuple[tuple, tuple]]] = None
+        # Views longer than this keep only the visible window of rows in
+        # the tree and page through the result as the user scrolls
+        self.virtualize_above = 2000
+        self.virtual = False
+        self.first_row = 0
+        self.page_size = 15
+        self.selected_row: Optional[int] = None
+        # Longer non-virtual views are formatted on a worker thread and
+        # inserted one batch per event-loop turn
+        self.populate_batch = 500
+        self.load_generation = 0
+        self.load_after_id = None
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -35,7 +55,7 @@ class TransactionViewFrame(ctk.CTkFrame):
         view_label = ctk.CTkLabel(header_frame, text="View:")
         view_label.grid(row=0, column=0, padx=(10, 5), pady=10)
         
-        self.view_var = ctk.StringVar(value="matches")
+        self.view_var = ctk.StringVar(value="Matches")
         view_combo = ctk.CTkComboBox(
             header_frame,
             values=["Matches", "Unmatched Bank", "Unmatched QuickBooks"],
@@ -88,16 +108,29 @@ class TransactionViewFrame(ctk.CTkFrame):
         self.tree.column("Confidence", width=100)
         self.tree.column("Status", width=100)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar; in virtual mode it tracks the position in the whole
+        # view rather than in the handful of items the tree holds
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.on_scrollbar)
+        self.tree.configure(yscrollcommand=self.on_tree_scrolled)
         
         # Grid treeview and scrollbar
         self.tree.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        scrollbar.grid(row=0, column=1, sticky="ns", pady=10)
+        self.scrollbar.grid(row=0, column=1, sticky="ns", pady=10)
         
         # Bind double-click for details
         self.tree.bind("<Double-1>", self.on_item_double_click)
+        
+        # Scrolling and resizing for virtual mode
+        self.tree.bind("<Configure>", self.on_tree_resized)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_mouse_wheel)
+        for sequence in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.tree.bind(sequence, self.on_key_scroll)
+        
+        # Progress of a batched load, shown only while one runs
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 10))
+        self.progress_bar.grid_remove()
     
     def update_data(self, result: ReconciliationResult):
         """Update the view with new reconciliation data"""
@@ -110,10 +143,6 @@ class TransactionViewFrame(ctk.CTkFrame):
             self.clear_data()
             return
         
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         # Get current view and confidence threshold
         view = self.view_var.get()
         min_confidence = float(self.confidence_var.get())
@@ -133,80 +162,238 @@ class TransactionViewFrame(ctk.CTkFrame):
         if not self.reconciliation_result:
             return
         
-        matches = [m for m in self.reconciliation_result.matches if m.confidence_score >= min_confidence]
-        
-        for match in matches:
-            # Format confidence as percentage
-            confidence_pct = f"{match.confidence_score * 100:.1f}%"
-            
-            # Determine status color
-            if match.confidence_score >= 0.95:
-                status = "Perfect"
-                tags = ("perfect",)
-            elif match.confidence_score >= 0.8:
-                status = "High"
-                tags = ("high",)
-            elif match.confidence_score >= 0.7:
-                status = "Medium"
-                tags = ("medium",)
-            else:
-                status = "Low"
-                tags = ("low",)
-            
-            # Insert into treeview
-            item = self.tree.insert(
-                "",
-                "end",
-                values=(
-                    match.bank_transaction.date.strftime("%Y-%m-%d"),
-                    match.bank_transaction.description[:50] + "..." if len(match.bank_transaction.description) > 50 else match.bank_transaction.description,
-                    f"${match.bank_transaction.amount:,.2f}",
-                    confidence_pct,
-                    status
-                ),
-                tags=tags
-            )
-            
-            # Store match data for double-click
-            self.tree.set(item, "match_data", match)
+        self.show_rows(self.reconciliation_result.matches_at_least(min_confidence), self.format_match)
     
     def display_unmatched_bank(self):
         """Display unmatched bank transactions"""
         if not self.reconciliation_result:
             return
         
-        for tx in self.reconciliation_result.unmatched_bank:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    tx.date.strftime("%Y-%m-%d"),
-                    tx.description[:50] + "..." if len(tx.description) > 50 else tx.description,
-                    f"${tx.amount:,.2f}",
-                    "",
-                    "Unmatched"
-                ),
-                tags=("unmatched",)
-            )
+        self.show_rows(self.reconciliation_result.unmatched_bank, self.format_transaction)
     
     def display_unmatched_quickbooks(self):
         """Display unmatched QuickBooks transactions"""
         if not self.reconciliation_result:
             return
         
-        for tx in self.reconciliation_result.unmatched_quickbooks:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    tx.date.strftime("%Y-%m-%d"),
-                    tx.description[:50] + "..." if len(tx.description) > 50 else tx.description,
-                    f"${tx.amount:,.2f}",
-                    "",
-                    "Unmatched"
-                ),
-                tags=("unmatched",)
-            )
+        self.show_rows(self.reconciliation_result.unmatched_quickbooks, self.format_transaction)
+    
+    @staticmethod
+    def format_description(description: str) -> str:
+        """Description truncated for the list"""
+        return description[:50] + "..." if len(description) > 50 else description
+    
+    def format_match(self, match: Match) -> Tuple[tuple, tuple]:
+        """Tree values and tags for a match"""
+        # Determine status color
+        if match.confidence_score >= 0.95:
+            status = "Perfect"
+        elif match.confidence_score >= 0.8:
+            status = "High"
+        elif match.confidence_score >= 0.7:
+            status = "Medium"
+        else:
+            status = "Low"
+        
+        values = (
+            match.bank_transaction.date.strftime("%Y-%m-%d"),
+            self.format_description(match.bank_transaction.description),
+            f"${match.bank_transaction.amount:,.2f}",
+            f"{match.confidence_score * 100:.1f}%",
+            status
+        )
+        return values, (status.lower(),)
+    
+    def format_transaction(self, tx) -> Tuple[tuple, tuple]:
+        """Tree values and tags for an unmatched transaction"""
+        values = (
+            tx.date.strftime("%Y-%m-%d"),
+            self.format_description(tx.description),
+            f"${tx.amount:,.2f}",
+            "",
+            "Unmatched"
+        )
+        return values, ("unmatched",)
+    
+    def show_rows(self, rows: Sequence[Any], formatter: Callable[[Any], Tuple[tuple, tuple]]):
+        """Show a sequence of rows, rendering only the visible window of long ones"""
+        self.cancel_population()
+        self.rows = rows
+        self.row_formatter = formatter
+        self.first_row = 0
+        self.selected_row = None
+        self.virtual = self.virtualize_above is not None and len(rows) > self.virtualize_above
+        
+        self.tree.delete(*self.tree.get_children())
+        if self.virtual:
+            self.render_window()
+        elif len(rows) > self.populate_batch:
+            self.populate(rows, formatter)
+        else:
+            self.insert_rows(0, [formatter(row) for row in rows])
+    
+    def insert_rows(self, start: int, formatted: List[Tuple[tuple, tuple]]):
+        """Insert pre-formatted rows; item ids are row positions"""
+        for offset, (values, tags) in enumerate(formatted):
+            self.tree.insert("", "end", iid=str(start + offset), values=values, tags=tags)
+    
+    def populate(self, rows: Sequence[Any], formatter: Callable[[Any], Tuple[tuple, tuple]]):
+        """Fill the tree in batches without blocking the event loop
+        
+        A worker thread formats the rows; the Tk side only inserts ready
+        batches. Starting another view bumps load_generation, which stops
+        both halves of this load.
+        """
+        generation = self.load_generation
+        batch_size = self.populate_batch
+        batches = queue.Queue()
+        total = len(rows)
+        
+        def format_rows():
+            try:
+                for start in range(0, total, batch_size):
+                    if generation != self.load_generation:
+                        return
+                    batches.put((start, [formatter(row) for row in rows[start:start + batch_size]]))
+            except Exception:
+                logger.exception("Failed to format transaction rows")
+                batches.put((None, None))
+        
+        threading.Thread(target=format_rows, daemon=True).start()
+        self.progress_bar.set(0)
+        self.progress_bar.grid()
+        self.load_after_id = self.after(1, self.insert_batch, generation, batches, total, 0)
+    
+    def insert_batch(self, generation: int, batches: queue.Queue, total: int, inserted: int):
+        """Insert the next formatted batch, then schedule the one after"""
+        self.load_after_id = None
+        if generation != self.load_generation:
+            return
+        
+        try:
+            start, formatted = batches.get_nowait()
+        except queue.Empty:
+            # Formatting is behind; check again shortly
+            self.load_after_id = self.after(10, self.insert_batch, generation, batches, total, inserted)
+            return
+        if formatted is None:
+            self.progress_bar.grid_remove()
+            return
+        
+        self.insert_rows(start, formatted)
+        inserted += len(formatted)
+        if inserted < total:
+            self.progress_bar.set(inserted / total)
+            self.load_after_id = self.after(1, self.insert_batch, generation, batches, total, inserted)
+        else:
+            self.progress_bar.grid_remove()
+    
+    def cancel_population(self):
+        """Abandon a batched load still in progress"""
+        self.load_generation += 1
+        if self.load_after_id is not None:
+            self.after_cancel(self.load_after_id)
+            self.load_after_id = None
+        self.progress_bar.grid_remove()
+    
+    def render_window(self):
+        """Replace the tree items with the rows scrolled into view"""
+        total = len(self.rows)
+        self.first_row = max(0, min(self.first_row, total - self.page_size))
+        last = min(total, self.first_row + self.page_size)
+        
+        self.tree.delete(*self.tree.get_children())
+        for index in range(self.first_row, last):
+            values, tags = self.row_formatter(self.rows[index])
+            self.tree.insert("", "end", iid=str(index), values=values, tags=tags)
+        
+        if self.selected_row is not None and self.first_row <= self.selected_row < last:
+            item = str(self.selected_row)
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+        
+        if total:
+            self.scrollbar.set(self.first_row / total, last / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def remember_selection(self):
+        """Keep the selected row across re-renders of the window"""
+        selection = self.tree.selection()
+        if selection:
+            self.selected_row = int(selection[0])
+    
+    def scroll_to(self, first_row: int):
+        """Show the window of rows starting at first_row"""
+        self.remember_selection()
+        self.first_row = first_row
+        self.render_window()
+    
+    def on_scrollbar(self, *args):
+        """Handle scrollbar drags and clicks"""
+        if not self.virtual:
+            self.tree.yview(*args)
+            return
+        
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.page_size if args[2] == "pages" else 1)
+            self.scroll_to(self.first_row + step)
+    
+    def on_tree_scrolled(self, first, last):
+        """Mirror the tree's own scrolling on the scrollbar outside virtual mode"""
+        if not self.virtual:
+            self.scrollbar.set(first, last)
+    
+    def on_mouse_wheel(self, event):
+        """Scroll the virtual window with the mouse wheel"""
+        if not self.virtual:
+            return None
+        
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.scroll_to(self.first_row + step)
+        return "break"
+    
+    def on_key_scroll(self, event):
+        """Move the selection with the keyboard, paging the virtual window"""
+        if not self.virtual or not self.rows:
+            return None
+        
+        focus = self.tree.focus()
+        current = int(focus) if focus else self.first_row
+        target = {
+            "Up": current - 1,
+            "Down": current + 1,
+            "Prior": current - self.page_size,
+            "Next": current + self.page_size,
+            "Home": 0,
+            "End": len(self.rows) - 1
+        }[event.keysym]
+        target = max(0, min(target, len(self.rows) - 1))
+        
+        if target < self.first_row:
+            self.first_row = target
+        elif target >= self.first_row + self.page_size:
+            self.first_row = target - self.page_size + 1
+        self.selected_row = target
+        self.render_window()
+        return "break"
+    
+    def on_tree_resized(self, event):
+        """Fit the virtual window to the rows the tree can show"""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Less the heading row
+        page_size = max(1, (event.height - row_height) // row_height)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            if self.virtual:
+                self.scroll_to(self.first_row)
     
     def update_stats(self):
         """Update statistics display"""
@@ -214,13 +401,11 @@ class TransactionViewFrame(ctk.CTkFrame):
             self.stats_label.configure(text="No data loaded")
             return
         
-        stats = self.reconciliation_result.get_summary_stats()
         view = self.view_var.get()
         
         if view == "Matches":
             min_confidence = float(self.confidence_var.get())
-            matches = [m for m in self.reconciliation_result.matches if m.confidence_score >= min_confidence]
-            count = len(matches)
+            count = self.reconciliation_result.count_matches_at_least(min_confidence)
             self.stats_label.configure(text=f"Showing {count} matches (≥{min_confidence*100:.0f}% confidence)")
         elif view == "Unmatched Bank":
             count = len(self.reconciliation_result.unmatched_bank)
@@ -244,32 +429,30 @@ class TransactionViewFrame(ctk.CTkFrame):
         if not selection:
             return
         
-        item = selection[0]
-        values = self.tree.item(item, "values")
+        row = self.row_for_item(selection[0])
+        if row is None:
+            return
         
-        if self.view_var.get() == "Matches":
+        if isinstance(row, Match):
             # Show match details
-            self.show_match_details(item)
+            self.show_match_details(row)
         else:
             # Show transaction details
-            self.show_transaction_details(values)
+            self.show_transaction_details(row)
     
-    def show_match_details(self, item):
-        """Show detailed information about a match"""
-        match_data = self.tree.item(item, "values")
-        
-        # Get the actual match object
-        match = None
-        for m in self.reconciliation_result.matches:
-            if (m.bank_transaction.date.strftime("%Y-%m-%d") == match_data[0] and
-                m.bank_transaction.description[:50] == match_data[1][:50] and
-                f"${m.bank_transaction.amount:,.2f}" == match_data[2]):
-                match = m
-                break
-        
-        if not match:
-            return
+    def row_for_item(self, item: str) -> Optional[Any]:
+        """The match or transaction behind a tree item
         
+        Item ids are positions in self.rows, which every population path
+        assigns, so this is a direct index rather than a search.
+        """
+        try:
+            return self.rows[int(item)]
+        except (ValueError, IndexError):
+            return None
+    
+    def show_match_details(self, match: Match):
+        """Show detailed information about a match"""
         details = f"""
 Match Details:
 
@@ -299,15 +482,15 @@ Match Information:
         text_widget.insert("1.0", details)
         text_widget.configure(state="disabled")
     
-    def show_transaction_details(self, values):
+    def show_transaction_details(self, tx):
         """Show detailed information about a transaction"""
         details = f"""
 Transaction Details:
 
-Date: {values[0]}
-Description: {values[1]}
-Amount: {values[2]}
-Status: {values[4]}
+Date: {tx.date.strftime('%Y-%m-%d')}
+Description: {tx.description}
+Amount: ${tx.amount:,.2f}
+Status: Unmatched
         """
         
         # Create detail window
@@ -322,8 +505,13 @@ Status: {values[4]}
     
     def clear_data(self):
         """Clear all displayed data"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.cancel_population()
+        self.tree.delete(*self.tree.get_children())
+        self.rows = []
+        self.virtual = False
+        self.first_row = 0
+        self.selected_row = None
+        self.scrollbar.set(0.0, 1.0)
         
         self.stats_label.configure(text="No data loaded")
         self.reconciliation_result = None 
\ No newline at end of file
@@ -6,21 +6,38 @@ Main application entry point
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+# Put the project root on the path so the src package imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.gui.main_window import ReconciliationApp
+# Set to report per-module import cost and time to first window, then exit
+STARTUP_TIMING_FLAG = "--startup-timing"
+STARTUP_TIMING_ENV = "RECONCILEBOOK_STARTUP_TIMING"
 
 def main():
     """Main application entry point"""
+    timer = None
+    if STARTUP_TIMING_FLAG in sys.argv[1:] or os.environ.get(STARTUP_TIMING_ENV):
+        from src.utils.startup_timing import ImportTimer
+        timer = ImportTimer()
+        timer.install()
+    
     try:
+        # Imported here rather than at module level: engine processes
+        # re-import this module on start and must not load the GUI stack
+        from src.gui.main_window import ReconciliationApp
+        
         app = ReconciliationApp()
+        if timer is not None:
+            timer.report_at_first_window(app.root)
         app.run()
     except Exception as e:
         print(f"Error starting application: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Needed for the matcher's process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
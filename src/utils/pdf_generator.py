@@ -24,7 +24,7 @@ class PDFGenerator:
     def setup_custom_styles(self):
         """Setup custom paragraph styles"""
         self.styles.add(ParagraphStyle(
-            name='Title',
+            name='ReportTitle',
             parent=self.styles['Heading1'],
             fontSize=18,
             spaceAfter=20,
@@ -75,7 +75,7 @@ class PDFGenerator:
         elements = []
         
         # Title
-        title = Paragraph("Reconciliation Report", self.styles['Title'])
+        title = Paragraph("Reconciliation Report", self.styles['ReportTitle'])
         elements.append(title)
         elements.append(Spacer(1, 30))
         
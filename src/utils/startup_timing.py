@@ -0,0 +1,112 @@
+"""
+Startup timing: per-module import cost and time to the first window
+"""
+
+import builtins
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# Where the report goes when there is no console to print it to
+REPORT_FILE_NAME = "reconcilebook-startup-timing.txt"
+
+
+class ImportTimer:
+    """Records how long each module takes to import while installed
+
+    Wraps builtins.__import__, so it also works in frozen builds where
+    python -X importtime is not available. Self time excludes nested
+    imports; cumulative time includes them.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.self_times: Dict[str, float] = {}
+        self.cumulative_times: Dict[str, float] = {}
+        self._nested: List[float] = []
+        self._original_import = None
+
+    def install(self):
+        """Start timing imports"""
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        """Stop timing imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        loaded = len(sys.modules)
+        self._nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+            # Imports of modules already loaded are dictionary lookups; skip them
+            if len(sys.modules) > loaded:
+                module = self._resolve(name, globals, level)
+                self.self_times[module] = self.self_times.get(module, 0.0) + elapsed - nested
+                self.cumulative_times[module] = self.cumulative_times.get(module, 0.0) + elapsed
+
+    @staticmethod
+    def _resolve(name: str, globals: Optional[dict], level: int) -> str:
+        if not level:
+            return name
+        package = (globals or {}).get("__package__") or ""
+        try:
+            return importlib.util.resolve_name("." * level + name, package)
+        except ImportError:
+            return "." * level + name
+
+    def report(self, first_window_seconds: float, limit: int = 25) -> str:
+        """Text summary, slowest imports (by self time) first"""
+        lines = [
+            f"Time to first window: {first_window_seconds * 1000:.0f} ms",
+            f"Modules imported: {len(self.self_times)}, "
+            f"import time: {sum(self.self_times.values()) * 1000:.0f} ms",
+            f"{'self ms':>9} {'cumul ms':>9}  module"
+        ]
+        slowest = sorted(self.self_times.items(), key=lambda item: item[1], reverse=True)[:limit]
+        for module, seconds in slowest:
+            lines.append(f"{seconds * 1000:9.1f} {self.cumulative_times[module] * 1000:9.1f}  {module}")
+        return "\n".join(lines)
+
+    def publish(self, report: str, root=None) -> Optional[str]:
+        """Print the report to stderr, or save it to a file if there is none
+        
+        Windowed builds run without a console, so sys.stderr is None; the
+        report is then written to the temp directory and its path shown in
+        a dialog over root. Returns the file path, if one was written.
+        """
+        if sys.stderr is not None:
+            print(report, file=sys.stderr)
+            return None
+        
+        path = os.path.join(tempfile.gettempdir(), REPORT_FILE_NAME)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(report + "\n")
+        if root is not None:
+            from tkinter import messagebox
+            messagebox.showinfo("Startup Timing", f"Startup timing report saved to:\n{path}", parent=root)
+        return path
+    
+    def report_at_first_window(self, root, exit_after: bool = True):
+        """Publish the report once Tk has drawn the first window, then optionally quit"""
+        def finish():
+            first_window = time.perf_counter() - self.started
+            self.uninstall()
+            self.publish(self.report(first_window), root)
+            if exit_after:
+                root.quit()
+
+        # Let the first event-loop pass map and draw the window
+        root.after(0, lambda: root.after_idle(finish))
@@ -0,0 +1,62 @@
+"""
+Shared test setup: make the src package importable from the repository root
+and provide seeded transaction data
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.models import Transaction  # noqa: E402
+
+WORDS = ["amazon", "office", "depot", "payroll", "stripe", "transfer", "rent", "acme",
+         "supply", "coffee", "fuel", "shell", "uber", "client", "payment", "invoice"]
+
+
+def make_transaction_pair(n, seed):
+    """Bank and QuickBooks lists where most bank rows have a QuickBooks twin
+
+    Twins are posted up to 5 days later with exact, off-by-a-cent, fee-reduced
+    or unrelated amounts and partly rewritten descriptions. A few rows carry
+    sub-cent amounts or a time of day, which take the scalar scoring path.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    bank, quickbooks = [], []
+    for i in range(n):
+        date = start + timedelta(days=rnd.randint(0, 60))
+        if rnd.random() < 0.05:
+            date += timedelta(hours=rnd.randint(1, 23))
+        amount = Decimal(rnd.choice([-1, 1]) * rnd.randint(100, 90000)) / 100
+        if rnd.random() < 0.05:
+            amount += Decimal("0.005")
+        description = " ".join(rnd.sample(WORDS, 3)) + f" {rnd.randint(1, 20)}"
+        bank.append(Transaction(id=f"bank_{i}", date=date, description=description,
+                                amount=amount, source="bank"))
+
+        roll = rnd.random()
+        if roll < 0.55:
+            qb_amount = amount
+        elif roll < 0.7:
+            qb_amount = amount - Decimal("0.01")
+        elif roll < 0.85:
+            qb_amount = (amount * Decimal("0.96")).quantize(Decimal("0.01"))
+        else:
+            qb_amount = Decimal(rnd.randint(100, 90000)) / 100
+        qb_description = description if rnd.random() < 0.5 else description.split()[0] + " " + rnd.choice(WORDS)
+        quickbooks.append(Transaction(id=f"quickbooks_{i}", date=date + timedelta(days=rnd.choice([0, 0, 1, 2, 3, 5])),
+                                      description=qb_description, amount=qb_amount, source="quickbooks"))
+    rnd.shuffle(quickbooks)
+    return bank, quickbooks
+
+
+@pytest.fixture
+def transaction_pair():
+    """Factory: transaction_pair(n, seed) -> (bank, quickbooks)"""
+    return make_transaction_pair
@@ -0,0 +1,69 @@
+"""
+Maximum-weight assignment checked against brute force on small random graphs
+"""
+
+import random
+from functools import lru_cache
+
+import pytest
+
+from src.core.assignment import max_weight_matching
+
+
+def brute_force_weight(edges):
+    """Best total weight of any matching, by DP over left nodes and used right nodes"""
+    lefts = sorted({left for left, _, _ in edges})
+    rights = sorted({right for _, right, _ in edges})
+    right_bit = {right: 1 << i for i, right in enumerate(rights)}
+    by_left = {left: [(right_bit[right], weight) for l, right, weight in edges if l == left] for left in lefts}
+
+    @lru_cache(maxsize=None)
+    def best(i, used):
+        if i == len(lefts):
+            return 0.0
+        total = best(i + 1, used)
+        for bit, weight in by_left[lefts[i]]:
+            if not used & bit:
+                total = max(total, weight + best(i + 1, used | bit))
+        return total
+
+    return best(0, 0)
+
+
+def random_graph(rnd, max_side=7):
+    n_left = rnd.randint(1, max_side)
+    n_right = rnd.randint(1, max_side)
+    density = rnd.uniform(0.2, 1.0)
+    # Few distinct weights make ties common
+    weights = [round(rnd.uniform(0.5, 1.0), 2) for _ in range(rnd.randint(1, 6))]
+    return [
+        (f"b{left}", f"q{right}", rnd.choice(weights))
+        for left in range(n_left)
+        for right in range(n_right)
+        if rnd.random() < density
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force_on_small_graphs(seed):
+    rnd = random.Random(seed)
+    for _ in range(25):
+        edges = random_graph(rnd)
+        weight_of = {(left, right): weight for left, right, weight in edges}
+
+        pairs = max_weight_matching(edges)
+
+        assert all(pair in weight_of for pair in pairs)
+        assert len({left for left, _ in pairs}) == len(pairs)
+        assert len({right for _, right in pairs}) == len(pairs)
+        total = sum(weight_of[pair] for pair in pairs)
+        assert total == pytest.approx(brute_force_weight(edges), abs=1e-9)
+
+
+def test_prefers_two_pairs_over_one_heavier_pair():
+    edges = [("b0", "q0", 0.95), ("b0", "q1", 0.9), ("b1", "q0", 0.9)]
+    assert sorted(max_weight_matching(edges)) == [("b0", "q1"), ("b1", "q0")]
+
+
+def test_empty_graph():
+    assert max_weight_matching([]) == []
@@ -0,0 +1,220 @@
+"""
+Vectorized kernels and blocked matching checked against the scalar scorer
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core.assignment import max_weight_matching
+from src.core.indexing import BlockingIndex
+from src.core.kernels import amount_similarity_batch, date_similarity_batch
+from src.core.matcher import TransactionMatcher
+from src.core.models import Transaction
+from src.core.parallel import shard_plan
+from src.core.processor import CSVProcessor
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def exhaustive_greedy(matcher, bank_transactions, quickbooks_transactions):
+    """The original find_matches: every pair scored with calculate_match_confidence"""
+    matches = []
+    matched_qb_ids = set()
+    qb_sorted = sorted(quickbooks_transactions, key=lambda x: x.date)
+    for bank_tx in sorted(bank_transactions, key=lambda x: x.date):
+        best, best_confidence = None, 0.0
+        for qb_tx in qb_sorted:
+            if qb_tx.id in matched_qb_ids:
+                continue
+            confidence, reason = matcher.calculate_match_confidence(bank_tx, qb_tx)
+            if confidence > best_confidence and confidence >= matcher.confidence_threshold:
+                best, best_confidence = (qb_tx, reason), confidence
+        if best:
+            matches.append((bank_tx.id, best[0].id, best_confidence, best[1]))
+            matched_qb_ids.add(best[0].id)
+    return matches
+
+
+def match_keys(result):
+    return [(m.bank_transaction.id, m.quickbooks_transaction.id, m.confidence_score, m.match_reason)
+            for m in result.matches]
+
+
+def configured_matcher(threshold, date_tolerance_days, amount_tolerance):
+    matcher = TransactionMatcher(threshold)
+    matcher.date_tolerance_days = date_tolerance_days
+    matcher.amount_tolerance = Decimal(amount_tolerance)
+    # Key matches score 1.0 by construction; compare the fuzzy path only
+    matcher.exact_key_prepass = False
+    return matcher
+
+
+@pytest.mark.parametrize("tolerance_days", range(0, 7))
+def test_date_kernel_matches_scalar(tolerance_days):
+    matcher = TransactionMatcher()
+    matcher.date_tolerance_days = tolerance_days
+    day = datetime(2024, 3, 1)
+    others = [day + timedelta(days=offset) for offset in range(-10, 11)]
+
+    batch = date_similarity_batch(day.toordinal(), np.array([d.toordinal() for d in others]), tolerance_days)
+
+    assert batch.tolist() == [matcher.calculate_date_similarity(day, other) for other in others]
+
+
+@pytest.mark.parametrize("tolerance_cents", [0, 1, 50])
+def test_amount_kernel_matches_scalar(tolerance_cents):
+    matcher = TransactionMatcher()
+    matcher.amount_tolerance = Decimal(tolerance_cents) / 100
+    rnd = random.Random(tolerance_cents)
+    # Fee-ratio boundaries (exactly 95%, just under) in both signs, zero and random pairs
+    pairs = [(2000, 1900), (2000, 1899), (-2000, -1900), (-2000, -1899), (1900, -2000),
+             (0, 0), (0, 500), (500, 0), (1, 1), (1, 2), (-1, 1)]
+    pairs += [(rnd.randint(-5000, 5000), rnd.randint(-5000, 5000)) for _ in range(300)]
+    pairs += [(cents, cents + rnd.randint(-60, 60)) for cents in (rnd.randint(-5000, 5000) for _ in range(300))]
+
+    for cents, other in pairs:
+        batch = amount_similarity_batch(cents, np.array([other], dtype=np.int64), tolerance_cents)
+        scalar = matcher.calculate_amount_similarity(Decimal(cents) / 100, Decimal(other) / 100)
+        assert batch[0] == scalar, (cents, other)
+
+
+@pytest.mark.parametrize("threshold,date_tolerance_days,amount_tolerance,seed", [
+    (0.5, 3, "0.01", 1),
+    (0.65, 3, "0.01", 2),
+    (0.7, 3, "0.01", 3),
+    (0.7, 1, "0.50", 4),
+    (0.85, 5, "0.01", 5),
+    (0.95, 3, "0.01", 6)
+])
+def test_greedy_matches_exhaustive_scalar_scoring(transaction_pair, threshold, date_tolerance_days,
+                                                  amount_tolerance, seed):
+    bank, quickbooks = transaction_pair(90, seed)
+    matcher = configured_matcher(threshold, date_tolerance_days, amount_tolerance)
+
+    result = matcher.find_matches(bank, quickbooks)
+
+    assert match_keys(result) == exhaustive_greedy(matcher, bank, quickbooks)
+    assert matcher.get_pruning_stats()["candidate_pairs"] < len(bank) * len(quickbooks)
+
+
+@pytest.mark.parametrize("threshold,seed", [(0.5, 7), (0.7, 8), (0.85, 9)])
+def test_optimal_reaches_best_total_over_all_pairs(transaction_pair, threshold, seed):
+    bank, quickbooks = transaction_pair(70, seed)
+    matcher = configured_matcher(threshold, 3, "0.01")
+    edges = []
+    for bank_tx in bank:
+        for qb_tx in quickbooks:
+            confidence, _ = matcher.calculate_match_confidence(bank_tx, qb_tx)
+            if confidence >= threshold:
+                edges.append((bank_tx.id, qb_tx.id, confidence))
+    weight_of = {(left, right): weight for left, right, weight in edges}
+    best_total = sum(weight_of[pair] for pair in max_weight_matching(edges))
+
+    result = matcher.find_matches(bank, quickbooks, mode="optimal")
+
+    for bank_id, qb_id, confidence, _ in match_keys(result):
+        assert confidence == weight_of[(bank_id, qb_id)]
+    assert sum(m.confidence_score for m in result.matches) == pytest.approx(best_total, abs=1e-9)
+
+
+@pytest.mark.parametrize("ingest", ["process_csv", "process_csv_table"])
+def test_incremental_run_on_a_second_ingest(ingest):
+    processor = CSVProcessor()
+
+    def load(name, source):
+        loaded = getattr(processor, ingest)(str(REPO_ROOT / name), source)
+        return loaded if ingest == "process_csv" else loaded.rows()
+
+    matcher = TransactionMatcher()
+    previous = matcher.find_matches(load("sample_bank_transactions.csv", "bank"),
+                                    load("sample_quickbooks_transactions.csv", "quickbooks"))
+    # Both files number their rows from 0, like the month's files did
+    new_bank = load("new-transactions-only.csv", "bank")
+    new_qb = load("new-transactions-only.csv", "quickbooks")
+
+    updated = matcher.find_matches_incremental(previous, new_bank, new_qb)
+
+    for side in (updated.bank_transactions, updated.quickbooks_transactions):
+        assert len({tx.id for tx in side}) == len(side)
+    assert len(updated.bank_transactions) == len(previous.bank_transactions) + len(new_bank)
+    assert updated.matches[:len(previous.matches)] == previous.matches
+    new_matches = updated.matches[len(previous.matches):]
+    assert [(m.bank_transaction.description, m.quickbooks_transaction.description) for m in new_matches] == \
+        [(tx.description, tx.description) for tx in new_bank]
+    assert [m.bank_transaction.id for m in new_matches] == [f"{tx.id}.1" for tx in new_bank]
+    assert [tx.id for tx in new_bank] == ["bank_0", "bank_1", "bank_2"]
+
+
+def crowded_pair(n, seed):
+    """Near-identical rows, so most bank rows' top candidates get claimed by earlier rows"""
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    bank = [Transaction(id=f"bank_{i}", date=start + timedelta(days=rnd.randint(0, 3)),
+                        description="monthly fee", amount=Decimal("12.00"), source="bank") for i in range(n)]
+    quickbooks = [Transaction(id=f"quickbooks_{i}", date=start + timedelta(days=rnd.randint(0, 3)),
+                              description="monthly fee" if i % 2 else "monthly fees",
+                              amount=Decimal("12.00") - Decimal(rnd.randint(0, 1)) / 100, source="quickbooks")
+                  for i in range(n)]
+    return bank, quickbooks
+
+
+@pytest.mark.parametrize("threshold,data", [
+    (0.5, "random"), (0.7, "random"), (0.85, "random"), (0.7, "crowded")
+])
+def test_pool_run_matches_serial_run(transaction_pair, threshold, data):
+    bank, quickbooks = transaction_pair(200, 11) if data == "random" else crowded_pair(60, 11)
+    serial, pooled = TransactionMatcher(threshold), TransactionMatcher(threshold)
+
+    serial_result = serial.find_matches(bank, quickbooks)
+    pooled_result = pooled.find_matches(bank, quickbooks, workers=2)
+
+    assert match_keys(pooled_result) == match_keys(serial_result)
+    assert pooled.get_pruning_stats()["key_matches"] == serial.get_pruning_stats()["key_matches"]
+
+
+def test_shards_get_only_the_quickbooks_rows_they_can_pair_with(transaction_pair):
+    bank, quickbooks = transaction_pair(400, 12)
+    matcher = TransactionMatcher()
+    bank_sorted = sorted(bank, key=lambda tx: tx.date)
+    blocking = BlockingIndex(sorted(quickbooks, key=lambda tx: tx.date),
+                             matcher.date_tolerance_days, matcher.amount_tolerance)
+    band = matcher.candidate_band()
+    assert band == BlockingIndex.BAND_CENTS
+
+    shards = shard_plan(bank_sorted, blocking, 8, band)
+
+    assert [(low, high) for low, high, _ in shards] == [(i, i + 50) for i in range(0, 400, 50)]
+    for bank_low, bank_high, positions in shards:
+        assert len(positions) < len(quickbooks) / 2
+        for bank_tx in bank_sorted[bank_low:bank_high]:
+            assert set(blocking.candidates(bank_tx, band)) <= set(positions)
+
+
+def test_reference_hit_needs_matching_amount_and_date():
+    day = datetime(2024, 3, 1)
+    bank = [
+        Transaction(id="bank_0", date=day, description="check 1234", amount=Decimal("50.00"), reference="1234"),
+        Transaction(id="bank_1", date=day, description="ach debit", amount=Decimal("80.00"), reference="ACH"),
+        Transaction(id="bank_2", date=day, description="wire", amount=Decimal("75.00"), reference="W-9")
+    ]
+    quickbooks = [
+        Transaction(id="qb_0", date=day, description="equipment", amount=Decimal("5000.00"), reference="1234"),
+        Transaction(id="qb_1", date=day + timedelta(days=30), description="ach debit", amount=Decimal("80.00"),
+                    reference="ACH"),
+        Transaction(id="qb_2", date=day + timedelta(days=1), description="wire out", amount=Decimal("75.00"),
+                    reference="w-9")
+    ]
+    matcher = TransactionMatcher()
+
+    result = matcher.find_matches(bank, quickbooks)
+
+    assert [(m.bank_transaction.id, m.quickbooks_transaction.id) for m in result.matches
+            if m.match_reason == "matching reference"] == [("bank_2", "qb_2")]
+    assert matcher.get_pruning_stats()["key_matches"] == 1
+    # The other pairs went through scoring; the $50 check cannot match the $5,000 entry
+    assert [tx.id for tx in result.unmatched_bank] == ["bank_0"]
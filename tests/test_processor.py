@@ -0,0 +1,60 @@
+"""
+Streamed CSV ingest checked against whole-file ingest
+"""
+
+import itertools
+from pathlib import Path
+
+import pytest
+
+from src.core.processor import CSVProcessor
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def rows(transactions):
+    return [(tx.id, tx.date, tx.description, tx.amount, tx.reference) for tx in transactions]
+
+
+@pytest.mark.parametrize("name", [
+    "sample_bank_transactions.csv", "sample_quickbooks_transactions.csv", "new-transactions-only.csv",
+    "sample-bank-transactions.csv", "test-transactions.csv"
+])
+@pytest.mark.parametrize("chunk_size", [1, 7, 50000])
+def test_streamed_rows_match_process_csv(name, chunk_size):
+    path = str(REPO_ROOT / name)
+
+    streamed = itertools.chain.from_iterable(CSVProcessor().iter_csv(path, "bank", chunk_size))
+
+    assert rows(streamed) == rows(CSVProcessor().process_csv(path, "bank"))
+
+
+def test_first_batch_comes_before_the_end_of_the_file(tmp_path):
+    # Few distinct dates never settle the format on their own; the last line
+    # is not UTF-8, so the reader raises if it gets that far
+    lines = [f"2024-01-{i % 20 + 1:02d},payment {i},{i + 1}.00" for i in range(20000)]
+    path = tmp_path / "statement.csv"
+    path.write_bytes(("Date,Description,Amount\n" + "\n".join(lines) + "\n").encode() + b"2024-01-01,caf\xe9,1.00\n")
+    processor = CSVProcessor()
+
+    batches = processor.iter_csv(str(path), "bank", chunk_size=1000)
+    first = next(batches)
+
+    assert len(first) == 1000
+    assert processor.date_format == "%Y-%m-%d"
+    with pytest.raises(ValueError):
+        list(batches)
+
+
+def test_dates_outside_the_locked_format_still_parse(tmp_path):
+    path = tmp_path / "statement.csv"
+    path.write_text("Date,Description,Amount\n" + "\n".join(
+        ["01/02/2024,rent,10.00"] * 10 + ["13/02/2024,fuel,5.00", "02/15/2024,coffee,3.00"]
+    ) + "\n")
+    processor = CSVProcessor()
+    processor.stream_hold_chunks = 1
+
+    streamed = list(itertools.chain.from_iterable(processor.iter_csv(str(path), "bank", chunk_size=5)))
+
+    assert processor.date_format == "%m/%d/%Y"
+    assert [(tx.date.month, tx.date.day) for tx in streamed[-2:]] == [(2, 13), (2, 15)]
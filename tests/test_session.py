@@ -0,0 +1,139 @@
+"""
+Session snapshots: save/load round trips and saving over an open session
+"""
+
+import copy
+import struct
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.core.matcher import TransactionMatcher
+from src.core.models import Transaction
+from src.core.session import (
+    SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _mapped_snapshots, _path_key, decode_result, encode_result,
+    load_session, matcher_settings, read_session_info, save_session
+)
+
+
+def fields(tx):
+    return (tx.id, tx.date, tx.description, tx.amount, tx.category, tx.account, tx.reference, tx.source)
+
+
+def summary(result):
+    return {
+        "bank": [fields(tx) for tx in result.bank_transactions],
+        "quickbooks": [fields(tx) for tx in result.quickbooks_transactions],
+        "matches": [
+            (fields(m.bank_transaction), fields(m.quickbooks_transaction), m.confidence_score, m.match_reason)
+            for m in result.matches
+        ],
+        "unmatched_bank": [fields(tx) for tx in result.unmatched_bank],
+        "unmatched_quickbooks": [fields(tx) for tx in result.unmatched_quickbooks],
+        "confidence_threshold": result.confidence_threshold,
+        "scoring_settings": result.scoring_settings
+    }
+
+
+def reconciled(transaction_pair, n=60, seed=0):
+    bank, quickbooks = transaction_pair(n, seed)
+    # Values the column encoding stores outside its int arrays
+    bank[0].amount = Decimal("1.005")
+    bank[1].date = datetime(2024, 1, 5, 13, 45, 10)
+    bank[2].reference = "CHK-1001"
+    quickbooks[0].category = "Office Supplies"
+    quickbooks[0].account = "Checking"
+    matcher = TransactionMatcher(0.6)
+    return matcher, matcher.find_matches(bank, quickbooks)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_round_trip_keeps_every_value(tmp_path, transaction_pair, seed):
+    matcher, result = reconciled(transaction_pair, seed=seed)
+    path = str(tmp_path / "books.rbsession")
+
+    save_session(result, path, matcher_settings(matcher))
+    loaded, settings = load_session(path)
+
+    assert summary(loaded) == summary(result)
+    assert settings == matcher_settings(matcher)
+    assert loaded.bank_transactions[0].amount == Decimal("1.005")
+    assert loaded.bank_transactions[1].date == datetime(2024, 1, 5, 13, 45, 10)
+
+
+def test_loaded_session_saves_again(tmp_path, transaction_pair):
+    _, result = reconciled(transaction_pair)
+    first, second = str(tmp_path / "first.rbsession"), str(tmp_path / "second.rbsession")
+
+    save_session(result, first)
+    loaded, _ = load_session(first)
+    save_session(loaded, second)
+
+    assert summary(load_session(second)[0]) == summary(result)
+
+
+def test_saving_over_the_open_session_keeps_its_data(tmp_path, transaction_pair):
+    _, result = reconciled(transaction_pair)
+    path = str(tmp_path / "books.rbsession")
+    save_session(result, path)
+    loaded, _ = load_session(path)
+    snapshots = list(_mapped_snapshots[_path_key(path)])
+    assert snapshots
+
+    loaded.remove_match(loaded.matches[0])
+    save_session(loaded, path)
+
+    assert all(snapshot.mapped.closed for snapshot in snapshots)
+    assert summary(load_session(path)[0]) == summary(loaded)
+    assert summary(loaded)["bank"] == summary(result)["bank"]
+
+
+def test_empty_result_round_trips(tmp_path):
+    result = TransactionMatcher().find_matches([], [])
+    path = str(tmp_path / "empty.rbsession")
+
+    save_session(result, path)
+
+    assert summary(load_session(path)[0]) == summary(result)
+
+
+def test_rejects_files_that_are_not_sessions(tmp_path):
+    path = tmp_path / "notes.rbsession"
+    path.write_bytes(b"date,amount\n2024-01-01,5\n")
+
+    with pytest.raises(ValueError):
+        load_session(str(path))
+
+
+def test_rejects_newer_snapshot_versions(tmp_path, transaction_pair):
+    _, result = reconciled(transaction_pair, n=5)
+    path = tmp_path / "future.rbsession"
+    save_session(result, str(path))
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<I", data, len(SNAPSHOT_MAGIC), SNAPSHOT_VERSION + 1)
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="newer"):
+        read_session_info(str(path))
+
+
+def test_encoded_result_decodes_onto_copied_transactions(transaction_pair):
+    _, result = reconciled(transaction_pair)
+    bank = [copy.copy(tx) for tx in result.bank_transactions]
+    quickbooks = [copy.copy(tx) for tx in result.quickbooks_transactions]
+
+    decoded = decode_result(encode_result(result), bank, quickbooks)
+
+    assert summary(decoded) == summary(result)
+    copied = {id(tx) for tx in bank}
+    assert all(id(m.bank_transaction) in copied for m in decoded.matches)
+
+
+def test_encoding_rejects_transactions_outside_the_result(transaction_pair):
+    _, result = reconciled(transaction_pair)
+    result.unmatched_bank.append(Transaction(id="stray", date=datetime(2024, 1, 1),
+                                             description="stray", amount=Decimal("1.00")))
+
+    with pytest.raises(ValueError, match="stray"):
+        encode_result(result)